@@ -0,0 +1,423 @@
+import base64
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+from datetime import datetime, timezone
+from html import escape
+from loguru import logger
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, quote, unquote
+from main import EpisodeIndex, OnePaceIndex, OnePaceMetadata, PackedData, read_yaml_file_safe
+from yaml import load as YamlLoad, SafeLoader
+
+def timed(func, *args, repeat=3):
+    best = None
+    result = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return (best, result)
+
+def report(label, elapsed, baseline=None):
+    if baseline is None:
+        print(f"  {label:<40} {elapsed * 1000:>10.1f} ms")
+    else:
+        print(f"  {label:<40} {elapsed * 1000:>10.1f} ms  ({baseline / elapsed:.2f}x)")
+
+def read_yaml_pure(file_paths):
+    results = []
+    for file_path in file_paths:
+        with file_path.open(mode="r", encoding="utf-8") as f:
+            results.append(YamlLoad(f, Loader=SafeLoader))
+
+    return results
+
+def bench_yaml(metadata):
+    files = []
+    for section in ("arcs", "descriptions", "episodes", "other_edits"):
+        files.extend(yml for key, yml in metadata.corpus_files(section) if yml is not None)
+
+    for scale in (1, 10):
+        file_paths = files * scale
+        print(f"YAML corpus x{scale} ({len(file_paths)} files)")
+
+        baseline, expected = timed(read_yaml_pure, file_paths, repeat=1)
+        report("safe_load, serial", baseline)
+
+        elapsed, results = timed(lambda: [read_yaml_file_safe(f) for f in file_paths])
+        report("C loader, serial", elapsed, baseline)
+
+        elapsed, results = timed(metadata.read_yaml_many, file_paths)
+        report("C loader, process pool", elapsed, baseline)
+
+        if [data for data, error in results] != expected:
+            print("  !! process pool results differ from safe_load")
+
+def load_model(metadata):
+    metadata.load_corpus()
+    now = datetime.now(tz=timezone.utc).replace(microsecond=0)
+
+    return {
+        "status": {"last_update": now.isoformat(), "last_update_ts": round(now.timestamp()), "base_url": "", "version": 0},
+        "tvshow": metadata.generate_tvshow(),
+        "arcs": metadata.generate_arcs(),
+        "descriptions": metadata.generate_descriptions(),
+        "episodes": metadata.generate_episodes(for_json=False),
+        "episodes_all": metadata.generate_episodes(for_json=False, exclude_archived=False),
+        "other_edits": metadata.generate_other_edits(for_json=False)
+    }
+
+def build_sqlite_per_row(metadata, data_file, rows, posters=None):
+    poster_map = {(lang, part): blob for blob, lang, part in posters or []}
+
+    with sqlite3.connect(data_file, timeout=15.0) as conn:
+        cursor = conn.cursor()
+
+        for table in Path("./schema.sql").read_text().split(";\n"):
+            cursor.execute(table)
+            conn.commit()
+
+        for table, columns in metadata.sqlite_columns().items():
+            query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+            for row in rows[table]:
+                if table == "arcs" and (row[0], row[1]) in poster_map:
+                    row = row[:-1] + (poster_map[(row[0], row[1])],)
+
+                cursor.execute(query, row)
+                if table in ("arcs", "arc_info"):
+                    conn.commit()
+
+            conn.commit()
+
+        for index in metadata.sqlite_indexes():
+            cursor.execute(index)
+
+        conn.commit()
+
+def bench_sqlite(metadata):
+    model = load_model(metadata)
+    rows = metadata.sqlite_rows(model["arcs"], model["episodes_all"], model["descriptions"], model["status"], model["tvshow"], model["other_edits"])
+    posters = metadata.sqlite_posters(model["arcs"])
+
+    print(f"SQLite build ({sum(len(v) for v in rows.values())} rows, {len(posters)} posters)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file = Path(tmp_dir, "data.sqlite")
+        posters_file = Path(tmp_dir, "data_with_posters.sqlite")
+
+        def before():
+            data_file.unlink(missing_ok=True)
+            posters_file.unlink(missing_ok=True)
+            build_sqlite_per_row(metadata, data_file, rows)
+            build_sqlite_per_row(metadata, posters_file, rows, posters)
+
+        def after():
+            data_file.unlink(missing_ok=True)
+            posters_file.unlink(missing_ok=True)
+            metadata.generate_sqlite(data_file, rows)
+            metadata.generate_sqlite_posters(data_file, posters_file, posters)
+
+        baseline, _ = timed(before)
+        report("per-row inserts, two full builds", baseline)
+
+        elapsed, _ = timed(after)
+        report("bulk load, posters derived", elapsed, baseline)
+
+def sample_crc32s(episodes, count=10000):
+    random.seed(0)
+
+    keys = list(episodes.keys())
+    misses = [f"{random.getrandbits(32):08X}" for _ in range(len(keys) // 10)]
+
+    return [random.choice(keys + misses) for _ in range(count)]
+
+def bench_index(metadata):
+    model = load_model(metadata)
+    episodes = model["episodes"]
+    rows = metadata.sqlite_rows(model["arcs"], model["episodes_all"], model["descriptions"], model["status"], model["tvshow"], model["other_edits"])
+    lookups = sample_crc32s(episodes)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_file = Path(tmp_dir, "episodes.min.json")
+        json_file.write_text(metadata.encode_json(episodes)[1], encoding="utf-8")
+
+        sqlite_file = Path(tmp_dir, "data.sqlite")
+        metadata.generate_sqlite(sqlite_file, rows)
+
+        index_file = Path(tmp_dir, "episodes.idx")
+        metadata.generate_episode_index(index_file, episodes)
+
+        print(f"CRC32 lookups ({len(episodes)} episodes, {len(lookups)} lookups)")
+        print(f"  sizes: json {json_file.stat().st_size} B, sqlite {sqlite_file.stat().st_size} B, idx {index_file.stat().st_size} B")
+
+        def json_lookup(crc32s):
+            with json_file.open(mode="r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            return [data.get(crc32) for crc32 in crc32s]
+
+        def sqlite_lookup(crc32s):
+            with sqlite3.connect(sqlite_file) as conn:
+                conn.row_factory = sqlite3.Row
+                query = "SELECT * FROM episodes WHERE hash_crc32 = ? AND archived = 0"
+                return [conn.execute(query, (crc32,)).fetchone() for crc32 in crc32s]
+
+        def index_lookup(crc32s):
+            with EpisodeIndex(index_file) as idx:
+                return [idx.get(crc32) for crc32 in crc32s]
+
+        for label, crc32s in (("open + 1 lookup", lookups[:1]), (f"open + {len(lookups)} lookups", lookups)):
+            baseline, _ = timed(json_lookup, crc32s)
+            report(f"{label}: json.load + dict", baseline)
+            elapsed, _ = timed(sqlite_lookup, crc32s)
+            report(f"{label}: sqlite index", elapsed, baseline)
+            elapsed, _ = timed(index_lookup, crc32s)
+            report(f"{label}: EpisodeIndex", elapsed, baseline)
+
+def bench_query(metadata):
+    model = load_model(metadata)
+    rows = metadata.sqlite_rows(model["arcs"], model["episodes_all"], model["descriptions"], model["status"], model["tvshow"], model["other_edits"])
+    lookups = sample_crc32s(model["episodes"], count=100000)
+
+    data = {key: model[key] for key in ("status", "tvshow", "arcs", "descriptions", "episodes", "other_edits")}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sqlite_file = Path(tmp_dir, "data.sqlite")
+        metadata.generate_sqlite(sqlite_file, rows)
+
+        json_file = Path(tmp_dir, "data.min.json")
+        json_file.write_text(metadata.encode_json(data)[1], encoding="utf-8")
+
+        print(f"OnePaceIndex.by_crc32 over a {len(lookups)} file library scan")
+
+        for label, source in (("sqlite", sqlite_file), ("json", json_file)):
+            for cache_size in (0, 4096):
+                def scan():
+                    with OnePaceIndex(source, cache_size=cache_size) as idx:
+                        return [idx.by_crc32(crc32) for crc32 in lookups]
+
+                elapsed, _ = timed(scan, repeat=1)
+                print(f"  {label + (', cached' if cache_size > 0 else ', uncached'):<40} {len(lookups) / elapsed:>10.0f} lookups/s")
+
+def scrape_gsheet_soup(metadata, resp_text):
+    data = []
+    poster = ""
+
+    soup = BeautifulSoup(resp_text, "html.parser")
+
+    img = soup.find("img")
+    if img and img.get("src"):
+        poster = img["src"]
+
+    table = soup.find("table", class_="waffle")
+    if table:
+        rows = []
+
+        for tr in table.find("tbody").find_all("tr"):
+            th = tr.find("div", class_="row-header-wrapper")
+            if not th:
+                continue
+
+            if th.get_text(strip=True) == "1":
+                for td in tr.find_all("td"):
+                    if td.has_attr("class") and td['class'][0].startswith("s"):
+                        rows.append(td.get_text(strip=True))
+                continue
+
+            inserted_data = {}
+            row_index = 0
+            has_contents = False
+            for td in tr.find_all("td"):
+                if td.has_attr("class") and td['class'][0].startswith("s"):
+                    text = metadata.unicode_fix(td.get_text(strip=True))
+                    links = td.find_all("a")
+
+                    if len(links) > 0:
+                        href = str(links[0].get("href"))
+                        if href.startswith("https://www.google.com/"):
+                            href = unquote(parse_qs(urlparse(href).query)['q'][0])
+
+                            inserted_data[rows[row_index]] = [text, href]
+                    else:
+                        inserted_data[rows[row_index]] = text
+
+                    row_index += 1
+
+                    if not has_contents and text != "":
+                        has_contents = True
+
+            if has_contents:
+                data.append(inserted_data)
+
+    return (data, poster)
+
+def gsheet_page(arc, episodes):
+    columns = ["One Pace Episode", "Chapters", "Episodes", "Release Date", "Length", "MKV CRC32", "MKV CRC32 (Extended)", "Notes"]
+
+    def link(crc32, file_id):
+        if crc32 == "":
+            return ""
+
+        url = f"https://www.google.com/url?q={quote(f'https://nyaa.si/view/{file_id}', safe='')}&sa=D&source=editors&ust=1700000000000000&usg=AOvVaw0"
+        return f'<a target="_blank" href="{escape(url)}">{crc32}</a>'
+
+    def row(n, cells, height=20):
+        tds = "".join(f'<td class="s{i % 5}{" softmerge" if i == 7 else ""}" dir="ltr">{c}</td>' for i, c in enumerate(cells))
+        return f'<tr style="height: {height}px"><th id="0R{n - 1}" style="height: {height}px;" class="row-headers-background"><div class="row-header-wrapper" style="line-height: {height}px">{n}</div></th>{tds}</tr>'
+
+    rows = [row(1, [escape(c) for c in columns])]
+    rows.append('<tr><th style="height:3px;" class="freezebar-cell freezebar-horizontal-handle"></th>' + '<td class="freezebar-cell freezebar-horizontal"></td>' * len(columns) + '</tr>')
+
+    for n, ep in enumerate(sorted(episodes, key=lambda x: (x["episode"], x["extended"])), start=2):
+        duration = int(ep.get("duration", 0))
+        file_id = ep.get("file", {}).get("id", 0)
+        rows.append(row(n, [
+            escape(f"{arc['title']} {ep['episode']:02d}"),
+            escape(str(ep.get("manga_chapters", ""))),
+            escape(str(ep.get("anime_episodes", ""))),
+            str(ep.get("released", ""))[:10].replace("-", "."),
+            f"{duration // 60}:{duration % 60:02d}",
+            link(ep["hashes"]["crc32"], file_id),
+            "",
+            f'<div class="softmerge-inner" style="width:200px;left:-1px">{escape("Re-release &amp; fixes")}&nbsp;<br>v2</div>' if n % 7 == 0 else ""
+        ]))
+
+    for n in range(len(rows) + 1, len(rows) + 40):
+        rows.append(row(n, [""] * len(columns)))
+
+    style = "".join(f".ritz .waffle .s{i}{{border-bottom:1px SOLID #000000;background-color:#ffffff;text-align:left;color:#000000;font-family:Arial;font-size:10pt;vertical-align:bottom;white-space:nowrap;direction:ltr;padding:2px 3px 2px 3px;}}" for i in range(40))
+    header = "".join(f'<th id="0C{i}" style="width:120px;" class="column-headers-background">{chr(65 + i)}</th>' for i in range(len(columns)))
+
+    return (
+        f'<html><head><meta name="viewport" content="width=device-width"><style type="text/css">{style}</style></head><body>'
+        f'<div class="ritz grid-container" dir="ltr"><div><img src="https://lh7-rt.googleusercontent.com/sheetsz/poster{arc["part"]}.png" alt=""></div>'
+        f'<table class="waffle" cellspacing="0" cellpadding="0"><thead><tr><th class="row-header freezebar-origin-ltr"></th>{header}</tr></thead>'
+        f'<tbody>{"".join(rows)}</tbody></table></div><!-- rendered --></body></html>'
+    )
+
+def bench_gsheet(metadata):
+    model = load_model(metadata)
+
+    by_arc = {}
+    for ep in model["episodes"].values():
+        by_arc.setdefault(ep["arc"], []).append(ep)
+
+    pages = [gsheet_page(arc, by_arc.get(arc["part"], [])) for arc in model["arcs"]["en"] if arc["part"] in by_arc]
+    largest = max(pages, key=len)
+
+    print(f"Sheets htmlview scraping ({len(pages)} pages, {sum(len(p) for p in pages) // 1024} KiB)")
+
+    baseline, expected = timed(lambda: [scrape_gsheet_soup(metadata, page) for page in pages])
+    report("BeautifulSoup tree", baseline)
+
+    elapsed, results = timed(lambda: [metadata.scrape_gsheet(page) for page in pages])
+    report("GSheetParser stream", elapsed, baseline)
+
+    if results != expected:
+        print("  !! GSheetParser results differ from BeautifulSoup")
+
+    for label, func in (("BeautifulSoup tree", scrape_gsheet_soup), ("GSheetParser stream", None)):
+        tracemalloc.start()
+        if func is None:
+            metadata.scrape_gsheet(largest)
+        else:
+            func(metadata, largest)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"  {label + ', peak memory on largest page':<40} {peak / 1024:>10.0f} KiB ({len(largest) // 1024} KiB page)")
+
+def bench_packed(metadata):
+    model = load_model(metadata)
+    data = metadata.normalize_json({key: model[key] for key in ("status", "tvshow", "arcs", "descriptions", "episodes", "other_edits")})
+
+    encoded_json = json.dumps(data, separators=(',', ':')).encode("utf-8")
+    encoded = PackedData.encode(data)
+
+    print(f"Full dataset encoding ({len(data['episodes'])} episodes)")
+    print(f"  {'data.min.json':<40} {len(encoded_json) / 1024:>10.0f} KiB")
+    print(f"  {'data.msgpack':<40} {len(encoded) / 1024:>10.0f} KiB ({len(encoded_json) / len(encoded):.2f}x smaller)")
+
+    baseline, expected = timed(json.loads, encoded_json, repeat=10)
+    report("json.loads (C)", baseline)
+
+    elapsed, result = timed(PackedData.decode, encoded, repeat=10)
+    report("PackedData.decode (pure Python)", elapsed, baseline)
+
+    if result != expected:
+        print("  !! PackedData results differ from json.loads")
+
+    elapsed, _ = timed(PackedData.encode, data, repeat=3)
+    report("PackedData.encode", elapsed)
+
+def bench_columns(metadata):
+    model = load_model(metadata)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        columns_file = Path(tmp, "episodes.columns.json")
+        metadata.generate_episode_columns(columns_file, model["episodes"])
+        encoded_columns = columns_file.read_bytes()
+
+    encoded_json = json.dumps(metadata.normalize_json(model["episodes"]), separators=(',', ':')).encode("utf-8")
+
+    print(f"Episodes export ({len(model['episodes'])} episodes)")
+    print(f"  {'episodes.min.json':<40} {len(encoded_json) / 1024:>10.0f} KiB")
+    print(f"  {'episodes.columns.json':<40} {len(encoded_columns) / 1024:>10.0f} KiB ({len(encoded_json) / len(encoded_columns):.2f}x smaller)")
+
+    baseline, rows = timed(json.loads, encoded_json, repeat=10)
+    report("json.loads, rows", baseline)
+
+    elapsed, columns = timed(json.loads, encoded_columns, repeat=10)
+    report("json.loads, columns", elapsed, baseline)
+
+    cutoff = round(datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp())
+
+    def filter_rows():
+        return [crc32 for crc32, ep in rows.items() if ep["extended"] and metadata.epoch(ep["released"]) >= cutoff]
+
+    def filter_columns():
+        c = columns["columns"]
+        extended = base64.b64decode(c["extended"])
+        return [f"{crc32:08X}" for i, (crc32, released) in enumerate(zip(c["crc32"], c["released"])) if extended[i >> 3] >> (i & 7) & 1 and released >= cutoff]
+
+    baseline, expected = timed(filter_rows, repeat=10)
+    report("extended and released >= 2024, rows", baseline)
+
+    elapsed, result = timed(filter_columns, repeat=10)
+    report("extended and released >= 2024, columns", elapsed, baseline)
+
+    if sorted(result) != sorted(expected):
+        print("  !! columnar filter results differ from rows")
+
+benchmarks = {
+    "yaml": bench_yaml,
+    "sqlite": bench_sqlite,
+    "index": bench_index,
+    "query": bench_query,
+    "gsheet": bench_gsheet,
+    "packed": bench_packed,
+    "columns": bench_columns
+}
+
+if __name__ == "__main__":
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    names = sys.argv[1:] if len(sys.argv) > 1 else list(benchmarks.keys())
+    metadata = OnePaceMetadata()
+
+    for name in names:
+        benchmarks[name](metadata)
@@ -1,8 +1,14 @@
 import asyncio
+import base64
+import bisect
+import copy
+import hashlib
+import gzip
 import httpx
 import httpx_retries
 import io
-import mimetypes
+import lzma
+import mmap
 import os
 import javaproperties
 import json
@@ -10,21 +16,89 @@ import re
 import shutil
 import sqlite3
 import string
+import struct
 import sys
+import threading
 import time
+import zlib
 
 from bs4 import BeautifulSoup
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from csv import DictReader as CSVReader
 from datetime import date, datetime, timezone, timedelta
-from functools import reduce
+from html.parser import HTMLParser
+from functools import lru_cache, partial, reduce
 from loguru import logger
 from pathlib import Path
 from rss_parser import RSSParser
 from urllib.parse import urlparse, parse_qs, unquote
-from yaml import safe_dump as YamlDump, safe_load as YamlLoad
+from yaml import dump as yaml_dump, load as YamlLoad
+
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+YamlDump = partial(yaml_dump, Dumper=YamlDumper)
+
+def read_yaml_file(file_path):
+    with file_path.open(mode="r", encoding="utf-8") as f:
+        return YamlLoad(f, Loader=YamlLoader)
+
+def read_yaml_file_safe(file_path):
+    try:
+        return (read_yaml_file(file_path), None)
+    except Exception as e:
+        return (None, f"{type(e).__name__}: {e}")
+
+HASH_BUFFER_SIZE = 8 * 1024 * 1024
+hash_buffers = threading.local()
+
+# zlib.crc32 and hashlib release the GIL on large buffers, so threads reading
+# into their own reused buffer keep up with the disk
+def hash_file(file_path, with_blake2s=False):
+    buf = getattr(hash_buffers, "buf", None)
+    if buf is None:
+        buf = hash_buffers.buf = bytearray(HASH_BUFFER_SIZE)
+
+    view = memoryview(buf)
+    blake2s = hashlib.blake2s() if with_blake2s else None
+    crc32 = 0
+    size = 0
+
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            while n := f.readinto(buf):
+                chunk = view[:n]
+                crc32 = zlib.crc32(chunk, crc32)
+                if blake2s is not None:
+                    blake2s.update(chunk)
+
+                chunk.release()
+                size += n
+    finally:
+        view.release()
+
+    return (crc32, blake2s.hexdigest() if blake2s is not None else None, size)
+
+def hash_file_safe(file_path, with_blake2s=False):
+    try:
+        return hash_file(file_path, with_blake2s) + (None,)
+    except OSError as e:
+        return (None, None, 0, f"{type(e).__name__}: {e}")
+
+class SourceUnavailable(Exception):
+    pass
 
 class OnePaceMetadata:
+    # Bump when the layout of the generated files changes
+    # 2: arc_info.lang in the SQLite databases
+    OUTPUT_SCHEMA_VERSION = 2
+
+    # Video files hashed by identify and backfill, matched case-insensitively
+    MEDIA_EXTENSIONS = {".mkv", ".mp4", ".avi", ".m4v"}
+
     def __init__(self):
         try:
             self.config = self.read_yaml(Path("../config.yml"))
@@ -37,6 +111,11 @@ class OnePaceMetadata:
         self.GITHUB_ACTIONS = 'GITHUB_ACTIONS' in os.environ
 
         self.client = None
+        self.http_limit = None
+        self.host_limits = {}
+        self.source_timings = []
+        self.http_index = {}
+        self.http_stats = {}
 
         self.arcs = {}
         self.arc_to_num = {}
@@ -49,21 +128,101 @@ class OnePaceMetadata:
         self.chapter_list = {}
 
         self.http_cache = OrderedDict()
+        self.documents = {}
+        self.episode_index = None
+        self.episode_index_files = {}
+        self.archive_versions = None
+        self.corpus = {}
         self.existing_sc = set()
         self.metadata_dir = Path(self.config["paths"]["metadata"])
         self.other_edits_dir = Path(self.config["paths"]["other_edits"])
+        self.cache_dir = Path(self.config["paths"].get("cache", "../.cache"))
 
     def read_yaml(self, file_path):
-        data = {}
-        with file_path.open(mode="r", encoding="utf-8") as f:
-            data = YamlLoad(stream=f)
+        return read_yaml_file(file_path)
 
-        return data
+    def read_yaml_many(self, file_paths, workers=None):
+        if workers is None:
+            workers = min(os.cpu_count() or 1, 8)
+
+        if workers > 1 and len(file_paths) >= 256:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    return list(pool.map(read_yaml_file_safe, file_paths, chunksize=max(1, len(file_paths) // (workers * 4))))
+            except (OSError, NotImplementedError, RuntimeError):
+                logger.exception("Unable to parse in parallel, falling back to a single process")
+
+        return [read_yaml_file_safe(file_path) for file_path in file_paths]
+
+    def write_yaml(self, file_path, data, atomic=False):
+        if atomic:
+            self.write_atomic(file_path, YamlDump(data, allow_unicode=True, sort_keys=False))
+            return
 
-    def write_yaml(self, file_path, data):
         with file_path.open(mode="w", encoding="utf-8") as f:
             YamlDump(data, stream=f, allow_unicode=True, sort_keys=False)
 
+    def dump_yaml(self, data):
+        return YamlDump(data, allow_unicode=True, sort_keys=False)
+
+    def dump_arc_yaml(self, data):
+        return self.dump_yaml(data).replace("\ninfo:\n", "\n\ninfo:\n").replace("\nepisodes:\n", "\n\nepisodes:\n")
+
+    # Documents read through load_doc are parsed once and changes saved with
+    # save_doc are kept in memory until flush_docs. New files are written
+    # right away, so is_file() checks keep working while the buffer is open.
+    # Callers get their own copy, only save_doc changes what gets written.
+    def load_doc(self, file_path):
+        doc = self.documents.get(str(file_path), None)
+
+        if doc is None:
+            text = file_path.read_text(encoding="utf-8")
+            doc = {"path": file_path, "text": text, "data": YamlLoad(text, Loader=YamlLoader), "dump": None}
+            self.documents[str(file_path)] = doc
+
+        return copy.deepcopy(doc["data"])
+
+    def save_doc(self, file_path, data, dump=None):
+        if dump is None:
+            dump = self.dump_yaml
+
+        doc = self.documents.get(str(file_path), None)
+
+        if doc is None and not file_path.is_file():
+            text = dump(data)
+            self.write_atomic(file_path, text)
+            self.documents[str(file_path)] = {"path": file_path, "text": text, "data": copy.deepcopy(data), "dump": None}
+            return
+
+        if doc is None:
+            self.load_doc(file_path)
+            doc = self.documents[str(file_path)]
+
+        doc["data"] = copy.deepcopy(data)
+        doc["dump"] = dump
+
+    def flush_docs(self):
+        written = 0
+        unchanged = 0
+
+        for doc in self.documents.values():
+            if doc["dump"] is None:
+                continue
+
+            text = doc["dump"](doc["data"])
+            doc["dump"] = None
+
+            if text == doc["text"]:
+                unchanged += 1
+                continue
+
+            self.write_atomic(doc["path"], text)
+            doc["text"] = text
+            written += 1
+
+        if written > 0 or unchanged > 0:
+            logger.info(f"Flushed {written} changed files ({unchanged} unchanged)")
+
     def datetime_serialize(self, dt):
         if isinstance(dt, date):
             return str(dt).replace('T', ' ').replace('+00:00', '')
@@ -95,6 +254,37 @@ class OnePaceMetadata:
 
         raise TypeError ("Type %s not serializable" % type(obj))
 
+    def normalize_json(self, obj):
+        if isinstance(obj, dict):
+            return {k: self.normalize_json(v) for k, v in obj.items()}
+        elif isinstance(obj, list):
+            return [self.normalize_json(v) for v in obj]
+        elif isinstance(obj, (date, datetime)):
+            return self.datetime_serialize(obj)
+
+        return obj
+
+    def encode_json(self, data):
+        data = self.normalize_json(data)
+        return (json.dumps(data, indent=2), json.dumps(data, separators=(',', ':')))
+
+    def join_json(self, parts):
+        pretty = ",\n  ".join(f"{json.dumps(k)}: {v[0]}".replace("\n", "\n  ") for k, v in parts.items())
+        minified = ",".join(f"{json.dumps(k)}:{v[1]}" for k, v in parts.items())
+
+        return ("{\n  " + pretty + "\n}" if len(parts) > 0 else "{}", "{" + minified + "}")
+
+    def write_atomic(self, file_path, content):
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+
+        tmp_file = file_path.with_name(f".{file_path.name}.tmp")
+        try:
+            tmp_file.write_bytes(content)
+            os.replace(tmp_file, file_path)
+        finally:
+            tmp_file.unlink(missing_ok=True)
+
     def escape_char(self, c):
         if c == "’":
             return "'"
@@ -108,6 +298,192 @@ class OnePaceMetadata:
     def unicode_fix(self, s):
         return ''.join(self.escape_char(c) for c in s)
 
+    def load_http_cache(self):
+        index_file = Path(self.cache_dir, "http", "index.json")
+        self.http_stats = {"not_modified": 0, "stored": 0, "uncached": 0}
+
+        try:
+            index = json.loads(index_file.read_text(encoding="utf-8"))
+            if index.get("version", 0) == 1:
+                self.http_index = index["entries"]
+                return
+        except FileNotFoundError:
+            pass
+        except:
+            logger.exception(f"Ignoring unreadable HTTP cache index: {index_file}")
+
+        self.http_index = {}
+
+    def save_http_cache(self):
+        http_cache_dir = Path(self.cache_dir, "http")
+        config = self.config.get("http_cache", {})
+        max_age = float(config.get("max_age_hours", 168)) * 3600
+        max_size = float(config.get("max_size_mb", 128)) * 1048576
+
+        now = time.time()
+        total_size = 0
+        entries = {}
+
+        # Least recently used entries go first once the cache is over its size limit
+        for key, entry in sorted(self.http_index.items(), key=lambda x: x[1]["used"], reverse=True):
+            if now - entry["used"] > max_age or total_size + entry["size"] > max_size:
+                Path(http_cache_dir, f"{key}.body").unlink(missing_ok=True)
+                continue
+
+            total_size += entry["size"]
+            entries[key] = entry
+
+        if not http_cache_dir.is_dir():
+            http_cache_dir.mkdir(exist_ok=True, parents=True)
+
+        self.write_atomic(Path(http_cache_dir, "index.json"), json.dumps({"version": 1, "entries": entries}, indent=2))
+
+        logger.info(
+            f"HTTP cache: {self.http_stats['not_modified']} not modified, {self.http_stats['stored']} stored, "
+            f"{self.http_stats['uncached']} uncached, {len(self.http_index) - len(entries)} evicted, {len(entries)} entries ({total_size / 1048576:.1f} MiB)"
+        )
+
+        self.http_index = entries
+
+    def host_limit(self, url):
+        host = urlparse(url).hostname or ""
+        if host not in self.host_limits:
+            self.host_limits[host] = asyncio.Semaphore(int(self.config.get("http_concurrency_per_host", 4)))
+
+        return self.host_limits[host]
+
+    def load_retry_policy(self):
+        config = self.config.get("http_retry", {})
+
+        self.deadline = time.monotonic() + float(self.config.get("update_deadline_minutes", 20)) * 60
+        self.retry = httpx_retries.Retry(
+            total=int(config.get("attempts", 5)),
+            backoff_factor=float(config.get("backoff_factor", 2.0)),
+            backoff_jitter=1.0,
+            max_backoff_wait=60.0
+        )
+        self.retry_budget = int(config.get("budget", 30))
+        self.http_timeout = float(config.get("timeout_seconds", 30))
+        self.host_failure_limit = int(config.get("host_failures", 5))
+        self.host_cooldown = float(config.get("host_cooldown_seconds", 300))
+        self.host_failures = {}
+        self.host_open_until = {}
+
+    def host_available(self, host):
+        return time.monotonic() >= self.host_open_until.get(host, 0)
+
+    async def request(self, url, headers=None, **kwargs):
+        host = urlparse(url).hostname or ""
+        retry = self.retry
+
+        while True:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= 0:
+                raise SourceUnavailable(f"Deadline reached, skipping {url}")
+            elif not self.host_available(host):
+                raise SourceUnavailable(f"{host} is unavailable, skipping {url}")
+
+            resp = None
+            try:
+                async with self.host_limit(url), self.http_limit:
+                    resp = await self.client.get(url, follow_redirects=True, headers=headers, timeout=min(self.http_timeout, remaining), **kwargs)
+
+                if not retry.is_retryable_status_code(resp.status_code):
+                    self.host_failures[host] = 0
+                    return resp
+
+                error = f"Status code {resp.status_code}"
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+
+            # Consecutive failures trip the breaker for the host, a success resets it
+            self.host_failures[host] = self.host_failures.get(host, 0) + 1
+            if self.host_failures[host] >= self.host_failure_limit and self.host_available(host):
+                self.host_open_until[host] = time.monotonic() + self.host_cooldown
+                logger.error(f"{host} failed {self.host_failures[host]} times in a row, skipping it for {self.host_cooldown:.0f}s")
+
+            retry = retry.increment()
+            wait = retry.backoff_strategy()
+            if resp is not None and resp.headers.get("retry-after", "") != "":
+                try:
+                    wait = min(retry.parse_retry_after(resp.headers["retry-after"]), retry.max_backoff_wait)
+                except ValueError:
+                    pass
+
+            if retry.is_exhausted() or self.retry_budget <= 0 or not self.host_available(host) or time.monotonic() + wait >= self.deadline:
+                if resp is not None:
+                    return resp
+
+                raise SourceUnavailable(f"Giving up on {url}: {error}")
+
+            self.retry_budget -= 1
+            logger.warning(f"{error} from {url}, retrying in {wait:.1f}s ({self.retry_budget} retries left)")
+            await asyncio.sleep(wait)
+
+    async def fetch(self, url, **kwargs):
+        key = hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+        body_file = Path(self.cache_dir, "http", f"{key}.body")
+        entry = self.http_index.get(key)
+        headers = dict(kwargs.pop("headers", {}))
+
+        if entry is not None and body_file.is_file():
+            if entry["etag"] != "":
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"] != "":
+                headers["If-Modified-Since"] = entry["last_modified"]
+        else:
+            entry = None
+
+        resp = await self.request(url, headers=headers, **kwargs)
+
+        if resp.status_code == 304 and entry is not None:
+            self.http_stats["not_modified"] += 1
+            entry["used"] = time.time()
+
+            return httpx.Response(200, headers={"content-type": entry["content_type"]}, content=body_file.read_bytes(), request=resp.request)
+
+        etag = resp.headers.get("etag", "")
+        last_modified = resp.headers.get("last-modified", "")
+
+        if resp.status_code != 200 or (etag == "" and last_modified == ""):
+            self.http_stats["uncached"] += 1
+            return resp
+
+        if not body_file.parent.is_dir():
+            body_file.parent.mkdir(exist_ok=True, parents=True)
+
+        self.write_atomic(body_file, resp.content)
+        self.http_stats["stored"] += 1
+        self.http_index[key] = {
+            "url": url.replace(self.GCLOUD_API_KEY, "<key>") if self.GCLOUD_API_KEY != "" else url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": resp.headers.get("content-type", ""),
+            "size": len(resp.content),
+            "used": time.time()
+        }
+
+        return resp
+
+    async def fetch_all(self, urls):
+        return await asyncio.gather(*[self.fetch(url) for url in urls], return_exceptions=True)
+
+    async def download_poster(self, url, poster_file, mime_type=None):
+        poster_resp = await self.request(url)
+        cont_type = poster_resp.headers.get("content-type", "")
+
+        if poster_resp.status_code == 200 and len(poster_resp.content) > 1024 and (mime_type is None or cont_type == mime_type):
+            poster_file.write_bytes(poster_resp.content)
+        elif mime_type is not None:
+            logger.error(f"Skipping downloading poster from {url}: invalid image or mime type invalid? [{cont_type}]")
+
+    async def download_posters(self, posters):
+        results = await asyncio.gather(*[self.download_poster(*poster) for poster in posters], return_exceptions=True)
+
+        for (url, poster_file, _), result in zip(posters, results):
+            if isinstance(result, Exception):
+                logger.error(f"Unable to download poster {url} to {poster_file}: {result}")
+
     def set_cache(self, k, v):
         if k in self.http_cache:
             del self.http_cache[k]
@@ -179,7 +555,7 @@ class OnePaceMetadata:
             return
 
         for arc_yml in self.arc_dir.rglob("config.yml"):
-            config_yml = self.read_yaml(arc_yml)
+            config_yml = self.load_doc(arc_yml)
 
             if not "title" in config_yml:
                 continue
@@ -189,67 +565,31 @@ class OnePaceMetadata:
                 self.arc_to_num[config_yml["originaltitle"]] = int(config_yml["part"])
 
     def scrape_gsheet(self, resp_text):
-        data = []
-        poster = ""
-
-        soup = BeautifulSoup(resp_text, "html.parser")
-
-        img = soup.find("img")
-        if img and img.get("src"):
-            poster = img["src"]
-
-        table = soup.find("table", class_="waffle")
-        if table:
-            rows = []
-
-            for tr in table.find("tbody").find_all("tr"):
-                th = tr.find("div", class_="row-header-wrapper")
-                if not th:
-                    continue
-
-                if th.get_text(strip=True) == "1":
-                    for td in tr.find_all("td"):
-                        if td.has_attr("class") and td['class'][0].startswith("s"):
-                            rows.append(td.get_text(strip=True))
-                    continue
-
-                inserted_data = {}
-                row_index = 0
-                has_contents = False
-                for td in tr.find_all("td"):
-                    if td.has_attr("class") and td['class'][0].startswith("s"):
-                        text = self.unicode_fix(td.get_text(strip=True))
-                        links = td.find_all("a")
-
-                        if len(links) > 0:
-                            href = str(links[0].get("href"))
-                            if href.startswith("https://www.google.com/"):
-                                href = unquote(parse_qs(urlparse(href).query)['q'][0])
-
-                                inserted_data[rows[row_index]] = [text, href]
-                        else:
-                            inserted_data[rows[row_index]] = text
-
-                        row_index += 1
+        parser = GSheetParser(self.unicode_fix)
+        parser.feed(resp_text)
+        parser.close()
 
-                        if not has_contents and text != "":
-                            has_contents = True
+        return (parser.data, parser.poster)
 
-                if has_contents:
-                    data.append(inserted_data)
+    async def get_titles_chapters(self):
+        title_props_resp, chapter_props_resp = await self.fetch_all([
+            "https://raw.githubusercontent.com/one-pace/one-pace-public-subtitles/refs/heads/main/main/title.properties",
+            "https://raw.githubusercontent.com/one-pace/one-pace-public-subtitles/refs/heads/main/main/chapter.properties"
+        ])
 
-        return (data, poster)
-
-    def get_titles_chapters(self):
         try:
-            title_props_resp = self.client.get("https://raw.githubusercontent.com/one-pace/one-pace-public-subtitles/refs/heads/main/main/title.properties", follow_redirects=True)
+            if isinstance(title_props_resp, Exception):
+                raise title_props_resp
+
             title_props = javaproperties.loads(title_props_resp.text)
         except:
             logger.exception("Unable to retrieve or parse title.properties")
             return False
 
         try:
-            chapter_props_resp = self.client.get("https://raw.githubusercontent.com/one-pace/one-pace-public-subtitles/refs/heads/main/main/chapter.properties", follow_redirects=True)
+            if isinstance(chapter_props_resp, Exception):
+                raise chapter_props_resp
+
             chapter_props = javaproperties.loads(chapter_props_resp.text)
         except:
             logger.exception("Unable to retrieve or parse chapter.properties")
@@ -301,11 +641,11 @@ class OnePaceMetadata:
 
         return True
 
-    def update_desc_sources(self):
+    async def update_desc_sources(self):
         urls = []
 
         if len(self.mkv_titles) == 0 or len(self.mkvcode) == 0:
-            self.get_titles_chapters()
+            await self.get_titles_chapters()
 
         if self.GCLOUD_API_KEY == "":
             logger.critical("GCLOUD_API_KEY not set")
@@ -320,9 +660,14 @@ class OnePaceMetadata:
             else:
                 logger.warning(f"Discarding: {source} (invalid URL)")
 
-        for doc_id in urls:
-            sheets_resp = self.client.get(f"https://sheets.googleapis.com/v4/spreadsheets/{doc_id}?key={self.GCLOUD_API_KEY}", follow_redirects=True)
-            if sheets_resp.status_code < 200 or sheets_resp.status_code >= 400:
+        jobs = []
+        all_sheets_resp = await self.fetch_all([f"https://sheets.googleapis.com/v4/spreadsheets/{doc_id}?key={self.GCLOUD_API_KEY}" for doc_id in urls])
+
+        for doc_id, sheets_resp in zip(urls, all_sheets_resp):
+            if isinstance(sheets_resp, Exception):
+                logger.error(f"Skipping: {doc_id}: {sheets_resp}")
+                continue
+            elif sheets_resp.status_code < 200 or sheets_resp.status_code >= 400:
                 logger.error(f"Skipping: {doc_id}: Status code {sheets_resp.status_code} returned")
                 continue
 
@@ -334,251 +679,244 @@ class OnePaceMetadata:
                 sheet_title = sheet["properties"]["title"]
 
                 if "Episodes" in sheet_title:
-                    self.parse_desc_episodes(doc_id, sheet_id, locale)
+                    jobs.append((self.parse_desc_episodes, doc_id, sheet_id, locale))
                 elif "Arcs" in sheet_title:
-                    self.parse_desc_arcs(doc_id, sheet_id, locale)
+                    jobs.append((self.parse_desc_arcs, doc_id, sheet_id, locale))
+
+        # Every export is fetched at once, but the sheets are applied in their original
+        # order since the arcs sheet fills arc_to_num for the episodes sheet
+        all_csv_resp = await self.fetch_all([f"https://docs.google.com/spreadsheets/d/{doc_id}/export?gid={sheet_id}&format=csv" for _, doc_id, sheet_id, _ in jobs])
+        posters = []
+
+        for (parse, doc_id, sheet_id, locale), resp in zip(jobs, all_csv_resp):
+            if isinstance(resp, Exception):
+                logger.error(f"Skipping: {doc_id} sheet {sheet_id}: {resp}")
+                continue
+            elif resp.status_code < 200 or resp.status_code >= 400:
+                logger.error(f"Skipping: {doc_id} sheet {sheet_id}: Status code {resp.status_code} returned")
+                continue
+
+            posters.extend(parse(resp, locale) or [])
+
+        await self.download_posters(posters)
 
         return True
 
-    def parse_desc_arcs(self, doc_id, sheet_id, locale):
+    def parse_desc_arcs(self, resp, locale):
         self.existing_sc = set()
+        posters = []
 
-        with self.client.stream("GET", f"https://docs.google.com/spreadsheets/d/{doc_id}/export?gid={sheet_id}&format=csv", follow_redirects=True) as resp:
-            reader = CSVReader(resp.iter_lines())
+        reader = CSVReader(resp.iter_lines())
 
-            title_key = "title"
-            desc_key = "description"
-            poster_key = "poster"
-            lang = ""
+        title_key = "title"
+        desc_key = "description"
+        poster_key = "poster"
+        lang = ""
 
-            for key in reader.fieldnames:
-                if "title" in key:
-                    title_key = key
-                elif "description" in key:
-                    desc_key = key
-                elif "poster" in key:
-                    poster_key = key
+        for key in reader.fieldnames:
+            if "title" in key:
+                title_key = key
+            elif "description" in key:
+                desc_key = key
+            elif "poster" in key:
+                poster_key = key
 
-            if "_" in title_key:
-                lang = title_key.split("_")[1].replace("-", "_").strip()
-            else:
-                lang = locale.replace("-", "_")
+        if "_" in title_key:
+            lang = title_key.split("_")[1].replace("-", "_").strip()
+        else:
+            lang = locale.replace("-", "_")
+
+        arc_lang_path = Path(self.arc_dir, lang)
+        if not arc_lang_path.is_dir():
+            arc_lang_path.mkdir(exist_ok=True, parents=True)
+            logger.info(f"Created directory: {arc_lang_path}")
 
-            arc_lang_path = Path(self.arc_dir, lang)
-            if not arc_lang_path.is_dir():
-                arc_lang_path.mkdir(exist_ok=True, parents=True)
-                logger.info(f"Created directory: {arc_lang_path}")
+        for row in reader:
+            if title_key not in row or "part" not in row or row[title_key] == "" or row["part"] == "":
+                continue
 
-            for row in reader:
-                if title_key not in row or "part" not in row or row[title_key] == "" or row["part"] == "":
+            part = row["part"].strip()
+            title = self.unicode_fix(row[title_key].strip())
+
+            if lang == "en":
+                if part == "11" and title.startswith("Whisk"):
+                    part = "10"
+                elif part == "10" and title.startswith("The Trials"):
+                    part = "11"
+                elif part == "99":
+                    part = "0"
+                elif int(part) > 90:
                     continue
 
-                part = row["part"].strip()
-                title = self.unicode_fix(row[title_key].strip())
-
-                if lang == "en":
-                    if part == "11" and title.startswith("Whisk"):
-                        part = "10"
-                    elif part == "10" and title.startswith("The Trials"):
-                        part = "11"
-                    elif part == "99":
-                        part = "0"
-                    elif int(part) > 90:
-                        continue
+            part_i = int(part)
+            saga = self.unicode_fix(row["saga_title"].strip()) if "saga_title" in row else ""
+            desc = self.unicode_fix(row[desc_key].strip())
+            mkvc = self.mkvcode[part_i] if len(self.mkvcode) > part_i else ""
+            shortc = self.generate_shortcode(title)
+
+            poster_url = row.get(poster_key, "").strip()
+            if poster_url != "":
+                poster_file = Path(arc_lang_path, part, "poster.png")
+                if not poster_file.is_file():
+                    posters.append((poster_url, poster_file, "image/png"))
+
+            config_yml = Path(arc_lang_path, part, "config.yml")
+            if not config_yml.is_file():
+                if not config_yml.parent.is_dir():
+                    config_yml.parent.mkdir(exist_ok=True)
+                    logger.info(f"Created directory: {config_yml.parent}")
+
+                self.save_doc(
+                    config_yml,
+                    self.generate_arc_tmpl(
+                        part=part_i,
+                        saga=saga,
+                        title=title,
+                        shortcode=shortc,
+                        mkvcode=mkvc,
+                        description=desc
+                    ),
+                    self.dump_arc_yaml
+                )
 
-                part_i = int(part)
-                saga = self.unicode_fix(row["saga_title"].strip()) if "saga_title" in row else ""
-                desc = self.unicode_fix(row[desc_key].strip())
-                mkvc = self.mkvcode[part_i] if len(self.mkvcode) > part_i else ""
-                shortc = self.generate_shortcode(title)
-
-                poster_url = row.get(poster_key, "").strip()
-                if poster_url != "":
-                    poster_file = Path(arc_lang_path, part, "poster.png")
-                    if not poster_file.is_file():
-                        with self.client.stream("GET", poster_url, follow_redirects=True) as poster_resp:
-                            cont_len = 0
-                            if "Content-Length" in poster_resp.headers:
-                                cont_len = int(poster_resp.headers["Content-Length"])
-                            elif "content-length" in poster_resp.headers:
-                                cont_len = int(poster_resp.headers["content-length"])
-
-                            cont_type = ""
-                            if "Content-Type" in poster_resp.headers:
-                                cont_type = poster_resp.headers["Content-Type"]
-                            elif "content-type" in poster_resp.headers:
-                                cont_type = poster_resp.headers["content-type"]
-
-                            if cont_len > 1024 and cont_type == "image/png":
-                                with poster_file.open(mode='wb') as f:
-                                    for chunk in poster_resp.iter_bytes():
-                                        f.write(chunk)
-                            else:
-                                logger.error(f"Skipping downloading poster from {poster_url}: invalid image or mime type invalid? [{cont_type}]")
-
-                config_yml = Path(arc_lang_path, part, "config.yml")
-                if not config_yml.is_file():
-                    if not config_yml.parent.is_dir():
-                        config_yml.parent.mkdir(exist_ok=True)
-                        logger.info(f"Created directory: {config_yml.parent}")
-
-                    config_yml.write_text(
-                        YamlDump(
-                            self.generate_arc_tmpl(
-                                part=part_i,
-                                saga=saga,
-                                title=title,
-                                shortcode=shortc,
-                                mkvcode=mkvc,
-                                description=desc
-                            ),
-                            allow_unicode=True, 
-                            sort_keys=False
-                        ).replace("\ninfo:\n", "\n\ninfo:\n").replace("\nepisodes:\n", "\n\nepisodes:\n"),
-                        encoding="utf-8"
-                    )
-
-                    logger.info(f"[{part} - {title}] Wrote to: {config_yml}")
+                logger.info(f"[{part} - {title}] Wrote to: {config_yml}")
 
-                else:
-                    data = self.read_yaml(config_yml)
-                    changed = False
+            else:
+                data = self.load_doc(config_yml)
+                changed = False
 
-                    if data.get("part", None) != part_i:
-                        changed = True
-                        logger.info(f"[{part} - {title}] Part: {data.get('part', None)} -> {part_i}")
-                        data["part"] = part_i
+                if data.get("part", None) != part_i:
+                    changed = True
+                    logger.info(f"[{part} - {title}] Part: {data.get('part', None)} -> {part_i}")
+                    data["part"] = part_i
 
-                    if data.get("saga", "") != saga:
-                        changed = True
-                        logger.info(f"[{part} - {title}] Saga: {data.get('saga', '')} -> {saga}")
-                        data["saga"] = saga
+                if data.get("saga", "") != saga:
+                    changed = True
+                    logger.info(f"[{part} - {title}] Saga: {data.get('saga', '')} -> {saga}")
+                    data["saga"] = saga
 
-                    if data.get("title", "") == "":
-                        changed = True
-                        logger.info(f"[{part} - {title}] Title: {data.get('title', '')} -> {title}")
-                        data["title"] = title
+                if data.get("title", "") == "":
+                    changed = True
+                    logger.info(f"[{part} - {title}] Title: {data.get('title', '')} -> {title}")
+                    data["title"] = title
 
-                    if data.get("description", "") != desc:
-                        changed = True
-                        logger.info(f"[{part} - {title}] Description: {data.get('description', '')} -> {desc}")
-                        data["description"] = desc
+                if data.get("description", "") != desc:
+                    changed = True
+                    logger.info(f"[{part} - {title}] Description: {data.get('description', '')} -> {desc}")
+                    data["description"] = desc
 
-                    if data.get("shortcode", "") != shortc:
-                        changed = True
-                        logger.info(f"[{part} - {title}] Shortcode: {data.get('shortcode', '')} -> {shortc}")
-                        data["shortcode"] = shortc
+                if data.get("shortcode", "") != shortc:
+                    changed = True
+                    logger.info(f"[{part} - {title}] Shortcode: {data.get('shortcode', '')} -> {shortc}")
+                    data["shortcode"] = shortc
 
-                    if data.get("mkvcode", "") != mkvc:
-                        changed = True
-                        logger.info(f"[{part} - {title}] MKV Code: {data.get('mkvcode', '')} -> {mkvc}")
-                        data["mkvcode"] = mkvc
+                if data.get("mkvcode", "") != mkvc:
+                    changed = True
+                    logger.info(f"[{part} - {title}] MKV Code: {data.get('mkvcode', '')} -> {mkvc}")
+                    data["mkvcode"] = mkvc
 
-                    if changed:
-                        config_yml.write_text(
-                            YamlDump(data, allow_unicode=True, sort_keys=False).replace("\ninfo:\n", "\n\ninfo:\n").replace("\nepisodes:\n", "\n\nepisodes:\n"),
-                            encoding="utf-8"
-                        )
-                        logger.info(f"-- Wrote to: {config_yml}")
+                if changed:
+                    self.save_doc(config_yml, data, self.dump_arc_yaml)
+                    logger.info(f"-- Wrote to: {config_yml}")
+
+            self.arc_to_num[title] = int(part)
 
-                self.arc_to_num[title] = int(part)
+        return posters
 
-    def parse_desc_episodes(self, doc_id, sheet_id, locale):
+    def parse_desc_episodes(self, resp, locale):
         logger.info("Updating Episode Descriptions")
 
-        with self.client.stream("GET", f"https://docs.google.com/spreadsheets/d/{doc_id}/export?gid={sheet_id}&format=csv", follow_redirects=True) as resp:
-            reader = CSVReader(resp.iter_lines())
+        reader = CSVReader(resp.iter_lines())
 
-            title_key = "title"
-            desc_key = "description"
-            lang = ""
+        title_key = "title"
+        desc_key = "description"
+        lang = ""
 
-            for key in reader.fieldnames:
-                if "title" in key:
-                    title_key = key
-                elif "description" in key:
-                    desc_key = key
+        for key in reader.fieldnames:
+            if "title" in key:
+                title_key = key
+            elif "description" in key:
+                desc_key = key
 
-            if "_" in title_key:
-                lang = title_key.split("_")[1].replace("-", "_").strip()
-            else:
-                lang = locale.replace("-", "_")
+        if "_" in title_key:
+            lang = title_key.split("_")[1].replace("-", "_").strip()
+        else:
+            lang = locale.replace("-", "_")
 
-            for row in reader:
-                if "arc_title" not in row or "arc_part" not in row or title_key not in row or desc_key not in row:
-                    logger.info(f"Not in row: {row}")
-                    continue
+        for row in reader:
+            if "arc_title" not in row or "arc_part" not in row or title_key not in row or desc_key not in row:
+                logger.info(f"Not in row: {row}")
+                continue
 
-                arc = self.unicode_fix(row["arc_title"].strip())
-                episode = row["arc_part"].strip()
-                title = self.unicode_fix(row[title_key].strip())
-                description = self.unicode_fix(row[desc_key].strip())
+            arc = self.unicode_fix(row["arc_title"].strip())
+            episode = row["arc_part"].strip()
+            title = self.unicode_fix(row[title_key].strip())
+            description = self.unicode_fix(row[desc_key].strip())
 
-                if arc == "" or episode == "" or title == "":
-                    continue
+            if arc == "" or episode == "" or title == "":
+                continue
 
-                if arc in self.arc_to_num:
-                    arc_num = self.arc_to_num[arc]
-                    ep_path = Path(self.arc_dir, lang, str(arc_num), f"episode_{int(episode):02d}.yml")
-                    changes = [f"{arc} {episode}: {ep_path}"]
+            if arc in self.arc_to_num:
+                arc_num = self.arc_to_num[arc]
+                ep_path = Path(self.arc_dir, lang, str(arc_num), f"episode_{int(episode):02d}.yml")
+                changes = [f"{arc} {episode}: {ep_path}"]
 
-                    try:
-                        if not ep_path.parent.is_dir():
-                            ep_path.parent.mkdir(exist_ok=True, parents=True)
-                            changes.append(f"-- Directory created: {ep_path.parent}")
+                try:
+                    if not ep_path.parent.is_dir():
+                        ep_path.parent.mkdir(exist_ok=True, parents=True)
+                        changes.append(f"-- Directory created: {ep_path.parent}")
 
-                        if ep_path.is_file():
-                            ep_data = self.read_yaml(ep_path)
-                            changed = False
+                    if ep_path.is_file():
+                        ep_data = self.load_doc(ep_path)
+                        changed = False
 
-                            if ep_data.get("title", "") != title:
-                                changes.append(f"-- Title: {ep_data.get('title', '')} -> {title}")
-                                ep_data["title"] = title
-                                changed = True
+                        if ep_data.get("title", "") != title:
+                            changes.append(f"-- Title: {ep_data.get('title', '')} -> {title}")
+                            ep_data["title"] = title
+                            changed = True
 
-                            if arc_num in self.mkv_titles and episode in self.mkv_titles[arc_num]:
-                                originaltitle = self.mkv_titles[arc_num][episode]
-                                if title.lower() != originaltitle.lower() and ep_data.get("originaltitle", "") != originaltitle:
-                                    changes.append(f"-- Original Title: {ep_data.get('originaltitle', None)} -> {originaltitle}")
-                                    ep_data["originaltitle"] = originaltitle
-                                    changed = True
-
-                            _title = ep_data.get("title", "").lower()
-                            _origtitle = ep_data.get("originaltitle", "").lower()
-                            if _title != "" and _origtitle != "" and _title == _origtitle:
-                                ep_data["originaltitle"] = ""
+                        if arc_num in self.mkv_titles and episode in self.mkv_titles[arc_num]:
+                            originaltitle = self.mkv_titles[arc_num][episode]
+                            if title.lower() != originaltitle.lower() and ep_data.get("originaltitle", "") != originaltitle:
+                                changes.append(f"-- Original Title: {ep_data.get('originaltitle', None)} -> {originaltitle}")
+                                ep_data["originaltitle"] = originaltitle
                                 changed = True
 
-                            if ep_data.get("description", "") != description:
-                                changes.append(f"-- Description: {ep_data.get('description', '')} -> {description}")
-                                ep_data["description"] = description
-                                changed = True
+                        _title = ep_data.get("title", "").lower()
+                        _origtitle = ep_data.get("originaltitle", "").lower()
+                        if _title != "" and _origtitle != "" and _title == _origtitle:
+                            ep_data["originaltitle"] = ""
+                            changed = True
 
-                            if changed:
-                                for line in changes:
-                                    logger.info(line)
-                                self.write_yaml(ep_path, ep_data)
-                                logger.info("-- Changes written to file")
+                        if ep_data.get("description", "") != description:
+                            changes.append(f"-- Description: {ep_data.get('description', '')} -> {description}")
+                            ep_data["description"] = description
+                            changed = True
 
-                        else:
-                            with ep_path.open(mode="w", encoding="utf-8") as f:
+                        if changed:
+                            for line in changes:
+                                logger.info(line)
+                            self.save_doc(ep_path, ep_data)
+                            logger.info("-- Changes written to file")
+
+                    else:
+                        originaltitle = ""
+                        if arc_num in self.mkv_titles and episode in self.mkv_titles[arc_num]:
+                            originaltitle = self.mkv_titles[arc_num][episode]
+                            if title.lower() == originaltitle.lower():
                                 originaltitle = ""
-                                if arc_num in self.mkv_titles and episode in self.mkv_titles[arc_num]:
-                                    originaltitle = self.mkv_titles[arc_num][episode]
-                                    if title.lower() == originaltitle.lower():
-                                        originaltitle = ""
-
-                                YamlDump({
-                                    "title": title,
-                                    "originaltitle": originaltitle,
-                                    "description": description
-                                }, stream=f, allow_unicode=True, sort_keys=False)
-                                logger.info(f"-- Wrote '{title}' to file")
 
-                    except:
-                        logger.exception("-- Unable to make changes")
+                        self.save_doc(ep_path, {
+                            "title": title,
+                            "originaltitle": originaltitle,
+                            "description": description
+                        })
+                        logger.info(f"-- Wrote '{title}' to file")
 
-    def update_from_episode_guide(self):
+                except:
+                    logger.exception("-- Unable to make changes")
+
+    async def update_from_episode_guide(self):
         if self.GCLOUD_API_KEY == "":
             logger.critical("GCLOUD_API_KEY not set")
             return
@@ -596,12 +934,20 @@ class OnePaceMetadata:
                 logger.error("Skipping: episode_guide does not have a valid Google Sheets URL")
                 return
 
-            ep_guide_resp = self.client.get(f"https://sheets.googleapis.com/v4/spreadsheets/{guide_id}?key={self.GCLOUD_API_KEY}", follow_redirects=True)
-            ep_guide_resp.raise_for_status()
+            sheets = None
+            if self.config.get("episode_guide_batch", True):
+                sheets = await self.fetch_episode_guide_grid(guide_id)
 
+            if sheets is None:
+                ep_guide_resp = await self.fetch(f"https://sheets.googleapis.com/v4/spreadsheets/{guide_id}?key={self.GCLOUD_API_KEY}")
+                ep_guide_resp.raise_for_status()
+                sheets = ep_guide_resp.json()["sheets"]
+
+            batch = len(sheets) > 0 and "data" in sheets[0]
             sheet_index = 0
+            jobs = []
 
-            for sheet in ep_guide_resp.json()["sheets"]:
+            for sheet in sheets:
                 properties = sheet["properties"]
 
                 sheet_id = properties["sheetId"]
@@ -609,127 +955,230 @@ class OnePaceMetadata:
                 #sheet_index = properties["index"]
 
                 if sheet_index == 0: #Arc Overview
-                    self.parse_arc_overview(guide_id, sheet_id)
+                    jobs.append((sheet, sheet_id, sheet_title, sheet_index, f"https://docs.google.com/spreadsheets/d/{guide_id}/export?gid={sheet_id}&format=csv"))
                     sheet_index += 1
 
                 elif "bandedRanges" in sheet:
-                    if not self.episodes_dir.is_dir():
-                        self.episodes_dir.mkdir(exist_ok=True, parents=True)
-                        logger.info(f"Created directory: {self.episodes_dir}")
+                    if Path(f"{self.arc_dir}/en/{sheet_index}/config.yml").is_file():
+                        jobs.append((sheet, sheet_id, sheet_title, sheet_index, f"https://docs.google.com/spreadsheets/u/0/d/{guide_id}/htmlview/sheet?headers=false&gid={sheet_id}"))
+
+                    sheet_index += 1
 
-                    config_yml = Path(f"{self.arc_dir}/en/{sheet_index}/config.yml")
-                    if config_yml.is_file():
-                        data = self.read_yaml(config_yml)
+            # The API doesn't return images placed over the grid, so the htmlview
+            # is still fetched for arcs that don't have a poster yet
+            if batch:
+                urls = [url if index > 0 and not Path(f"{self.arc_dir}/en/{index}/poster.png").is_file() else None for _, _, _, index, url in jobs]
+                logger.info(f"Retrieved {len(jobs)} sheets from the episode guide, {len([url for url in urls if url is not None])} more for posters")
+            else:
+                urls = [url for _, _, _, _, url in jobs]
+                logger.info(f"Retrieving {len(jobs)} sheets from the episode guide")
 
-                        if "title" in data and sheet_title.lower() != data["title"].lower():
-                            data["originaltitle"] = f"{data['title']}"
-                            data["title"] = sheet_title
-                            self.arc_to_num[sheet_title] = int(sheet_index)
-                            config_yml.write_text(
-                                YamlDump(data, allow_unicode=True, sort_keys=False).replace("\ninfo:\n", "\n\ninfo:\n").replace("\nepisodes:\n", "\n\nepisodes:\n"),
-                                encoding="utf-8"
-                            )
+            all_resp = iter(await self.fetch_all([url for url in urls if url is not None]))
+            posters = []
 
-                        self.parse_spreadsheet_page(guide_id, sheet_id, sheet_title, sheet_index)
+            for (sheet, sheet_id, sheet_title, sheet_index, _), url in zip(jobs, urls):
+                resp = next(all_resp) if url is not None else None
 
-                    sheet_index += 1
+                if isinstance(resp, Exception):
+                    logger.error(f"Skipping: Sheet {sheet_id} ({sheet_title}): {resp}")
+                    if not batch:
+                        continue
 
+                    resp = None
+                elif resp is not None and (resp.status_code < 200 or resp.status_code >= 400):
+                    logger.error(f"Skipping: Sheet {sheet_id} ({sheet_title}): Status code {resp.status_code} returned")
+                    if not batch:
+                        continue
+
+                    resp = None
+
+                if sheet_index == 0:
+                    self.parse_arc_overview(self.grid_dicts(self.grid_rows(sheet)) if batch else CSVReader(resp.iter_lines()))
+                    continue
+
+                if not self.episodes_dir.is_dir():
+                    self.episodes_dir.mkdir(exist_ok=True, parents=True)
+                    logger.info(f"Created directory: {self.episodes_dir}")
+
+                config_yml = Path(f"{self.arc_dir}/en/{sheet_index}/config.yml")
+                data = self.load_doc(config_yml)
+
+                if "title" in data and sheet_title.lower() != data["title"].lower():
+                    data["originaltitle"] = f"{data['title']}"
+                    data["title"] = sheet_title
+                    self.arc_to_num[sheet_title] = int(sheet_index)
+                    self.save_doc(config_yml, data, self.dump_arc_yaml)
+
+                if batch:
+                    sheet_data = self.grid_sheet_data(self.grid_rows(sheet))
+                    poster = self.scrape_gsheet(resp.text)[1] if resp is not None else ""
+                else:
+                    sheet_data, poster = self.scrape_gsheet(resp.text)
+
+                poster = await self.parse_spreadsheet_page(sheet_data, poster, sheet_title, sheet_index)
+                if poster is not None:
+                    posters.append(poster)
+
+            await self.download_posters(posters)
+
+        except SourceUnavailable:
+            raise
         except:
             logger.exception("Unable to update from Episode Guide")
 
+    async def fetch_episode_guide_grid(self, guide_id):
+        fields = "sheets(properties(sheetId,title),bandedRanges(bandedRangeId),data(rowData(values(formattedValue,hyperlink,textFormatRuns(format(link(uri)))))))"
+
+        try:
+            resp = await self.fetch(f"https://sheets.googleapis.com/v4/spreadsheets/{guide_id}?key={self.GCLOUD_API_KEY}&includeGridData=true&fields={fields}")
+            resp.raise_for_status()
+            return resp.json()["sheets"]
+        except SourceUnavailable:
+            raise
+        except:
+            logger.exception("Unable to retrieve the episode guide in one request, falling back to one request per sheet")
+
+        return None
+
+    def grid_rows(self, sheet):
+        rows = []
+
+        for grid in sheet.get("data", []):
+            for row_data in grid.get("rowData", []):
+                row = []
+
+                for value in row_data.get("values", []):
+                    link = value.get("hyperlink", None)
+                    if link is None:
+                        for run in value.get("textFormatRuns", []):
+                            link = run.get("format", {}).get("link", {}).get("uri", None)
+                            if link is not None:
+                                break
+
+                    row.append((str(value.get("formattedValue", "")), link))
+
+                rows.append(row)
+
+        return rows
+
+    def grid_dicts(self, rows):
+        if len(rows) == 0:
+            return []
+
+        headers = [value for value, link in rows[0]]
+        return [{header: row[i][0] if i < len(row) else "" for i, header in enumerate(headers)} for row in rows[1:]]
+
+    def grid_text(self, value):
+        return "".join(line.strip() for line in value.splitlines())
+
+    # Same row dicts as scrape_gsheet: linked cells become [text, url]
+    def grid_sheet_data(self, rows):
+        if len(rows) == 0:
+            return []
+
+        headers = [self.grid_text(value) for value, link in rows[0]]
+        data = []
+
+        for row in rows[1:]:
+            inserted_data = {}
+            has_contents = False
+
+            for i, header in enumerate(headers):
+                value, link = row[i] if i < len(row) else ("", None)
+                text = self.unicode_fix(self.grid_text(value))
+
+                inserted_data[header] = [text, link] if link is not None else text
+
+                if not has_contents and text != "":
+                    has_contents = True
+
+            if has_contents:
+                data.append(inserted_data)
+
+        return data
+
     def safe_int(self, i):
         try:
             return 0 if i == "" else int(i)
         except ValueError:
             return 0
 
-    def parse_arc_overview(self, guide_id, sheet_id):
-        with self.client.stream("GET", f"https://docs.google.com/spreadsheets/d/{guide_id}/export?gid={sheet_id}&format=csv", follow_redirects=True) as resp:
-            reader = CSVReader(resp.iter_lines())
-
-            arc_num = 0
-            for row in reader:
-                if row.get("Arcs", "") == "Totals":
-                    break
-                elif row.get("No.", "") == "":
-                    continue
-
-                arc_num += 1
+    def parse_arc_overview(self, reader):
+        arc_configs = {}
+        for arc_folder in self.arc_dir.iterdir():
+            for config_yml in Path(arc_folder).glob("*/config.yml"):
+                arc_configs.setdefault(config_yml.parent.name, []).append(config_yml)
 
-                for arc_folder in self.arc_dir.iterdir():
-                    config_yml = Path(arc_folder, str(arc_num), "config.yml")
-                    if not config_yml.is_file():
-                        continue
+        arc_num = 0
+        for row in reader:
+            if row.get("Arcs", "") == "Totals":
+                break
+            elif row.get("No.", "") == "":
+                continue
 
-                    arc_name = row.get("Arcs", "")
-                    manga_chapters = row.get("Manga Chapters", "")
-                    num_of_chapters = self.safe_int(row.get("# of Ch.", "0"))
-                    anime_episodes = row.get("Anime Episodes", "")
-                    episodes_adapted = self.safe_int(row.get("Episodes Adapted", "0"))
-                    filler_episodes = row.get("Filler Episodes", "")
-                    num_of_pace_eps = self.safe_int(row.get("# of Pace Ep.", "0"))
-                    piece_minutes = self.safe_int(row.get("Piece Minutes", "0"))
-                    pace_minutes = self.safe_int(row.get("Pace Minutes", "0"))
-                    audio_languages = row.get("Audio Languages", "")
-                    sub_languages = row.get("Sub Languages", "")
-                    pixeldrain_only = row.get("Pixeldrain only", "")
-                    resolution = row.get("Resolution", "")
-                    arc_watch_guide = row.get("Arc Watch Guide: Pace + Original", "")
-
-                    status = ""
-                    if "(TBR)" in arc_name:
-                        status = "To Be Redone"
-                    elif "(WIP)" in arc_name:
-                        status = "Work In Progress"
-
-                    data = self.read_yaml(config_yml)
-                    if "info" not in data:
-                        data["info"] = {}
-
-                    new_info = {
-                        "status": status,
-                        "manga_chapters": manga_chapters,
-                        "num_of_chapters": num_of_chapters,
-                        "anime_episodes": anime_episodes,
-                        "episodes_adapted": episodes_adapted,
-                        "filler_episodes": filler_episodes,
-                        "num_of_pace_eps": num_of_pace_eps,
-                        "piece_minutes": piece_minutes,
-                        "pace_minutes": pace_minutes,
-                        "audio_languages": audio_languages,
-                        "sub_languages": sub_languages,
-                        "pixeldrain_only": pixeldrain_only,
-                        "resolution": resolution,
-                        "arc_watch_guide": arc_watch_guide
-                    }
+            arc_num += 1
+
+            for config_yml in arc_configs.get(str(arc_num), []):
+                arc_name = row.get("Arcs", "")
+                manga_chapters = row.get("Manga Chapters", "")
+                num_of_chapters = self.safe_int(row.get("# of Ch.", "0"))
+                anime_episodes = row.get("Anime Episodes", "")
+                episodes_adapted = self.safe_int(row.get("Episodes Adapted", "0"))
+                filler_episodes = row.get("Filler Episodes", "")
+                num_of_pace_eps = self.safe_int(row.get("# of Pace Ep.", "0"))
+                piece_minutes = self.safe_int(row.get("Piece Minutes", "0"))
+                pace_minutes = self.safe_int(row.get("Pace Minutes", "0"))
+                audio_languages = row.get("Audio Languages", "")
+                sub_languages = row.get("Sub Languages", "")
+                pixeldrain_only = row.get("Pixeldrain only", "")
+                resolution = row.get("Resolution", "")
+                arc_watch_guide = row.get("Arc Watch Guide: Pace + Original", "")
+
+                status = ""
+                if "(TBR)" in arc_name:
+                    status = "To Be Redone"
+                elif "(WIP)" in arc_name:
+                    status = "Work In Progress"
+
+                data = self.load_doc(config_yml)
+                if "info" not in data:
+                    data["info"] = {}
+
+                new_info = {
+                    "status": status,
+                    "manga_chapters": manga_chapters,
+                    "num_of_chapters": num_of_chapters,
+                    "anime_episodes": anime_episodes,
+                    "episodes_adapted": episodes_adapted,
+                    "filler_episodes": filler_episodes,
+                    "num_of_pace_eps": num_of_pace_eps,
+                    "piece_minutes": piece_minutes,
+                    "pace_minutes": pace_minutes,
+                    "audio_languages": audio_languages,
+                    "sub_languages": sub_languages,
+                    "pixeldrain_only": pixeldrain_only,
+                    "resolution": resolution,
+                    "arc_watch_guide": arc_watch_guide
+                }
 
-                    changed = len(data["info"]) != len(new_info)
-                    for k in new_info.keys():
-                        if new_info[k] != data["info"].get(k, None):
-                            logger.info(f"[{arc_name}] {k}: {data['info'].get(k, None)} -> {new_info[k]}")
-                            changed = True
+                changed = len(data["info"]) != len(new_info)
+                for k in new_info.keys():
+                    if new_info[k] != data["info"].get(k, None):
+                        logger.info(f"[{arc_name}] {k}: {data['info'].get(k, None)} -> {new_info[k]}")
+                        changed = True
 
-                    if changed:
-                        data["info"] = new_info
-                        config_yml.write_text(
-                            YamlDump(data, allow_unicode=True, sort_keys=False).replace("\ninfo:\n", "\n\ninfo:\n").replace("\nepisodes:\n", "\n\nepisodes:\n"),
-                            encoding="utf-8"
-                        )
-    
-                        logger.info(f"[{arc_name}] Wrote to: {config_yml}")
+                if changed:
+                    data["info"] = new_info
+                    self.save_doc(config_yml, data, self.dump_arc_yaml)
 
-    def parse_spreadsheet_page(self, guide_id, sheet_id, sheet_title, sheet_index):
-        logger.info(f"[{sheet_title}] Retrieving HTML sheet {sheet_title} {sheet_index}")
+                    logger.info(f"[{arc_name}] Wrote to: {config_yml}")
 
-        resp = self.client.get(f"https://docs.google.com/spreadsheets/u/0/d/{guide_id}/htmlview/sheet?headers=false&gid={sheet_id}", follow_redirects=True)
-        if resp.status_code < 200 or resp.status_code >= 400:
-            logger.error(f"Skipping: Sheet {sheet_id} ({sheet_title})")
-            return
+    async def parse_spreadsheet_page(self, sheet_data, poster, sheet_title, sheet_index):
+        logger.info(f"[{sheet_title}] Parsing sheet {sheet_title} {sheet_index}")
 
         if not self.episodes_dir.is_dir():
             self.episodes_dir.mkdir(exist_ok=True)
 
-        sheet_data, poster = self.scrape_gsheet(resp.text)
         for row in sheet_data:
             if "MKV CRC32" not in row:
                 continue
@@ -807,7 +1256,7 @@ class OnePaceMetadata:
 
                 if config_yml.is_file():
                     changed = False
-                    config_data = self.read_yaml(config_yml)
+                    config_data = self.load_doc(config_yml)
                     ep_str = f"{ep:02d}"
 
                     if "episodes" not in config_data or isinstance(config_data["episodes"], dict):
@@ -850,17 +1299,14 @@ class OnePaceMetadata:
 
                     if changed:
                         config_data["episodes"].sort(key=lambda x: int(x["episode"]))
-                        config_yml.write_text(
-                            YamlDump(config_data, allow_unicode=True, sort_keys=False).replace("\ninfo:\n", "\n\ninfo:\n").replace("\nepisodes:\n", "\n\nepisodes:\n"),
-                            encoding="utf-8"
-                        )
+                        self.save_doc(config_yml, config_data, self.dump_arc_yaml)
 
             crc_file = Path(self.episodes_dir, f"{mkv_crc32[0]}.yml")
             if not crc_file.is_file():
                 crc_archive_file = Path(self.episodes_dir, "archive", f"{mkv_crc32[0]}.yml")
 
                 if not crc_archive_file.is_file():
-                    self.create_crc_file(sheet_index, ep, crc_file, mkv_crc32, chapters, episodes, release_date, length, False)
+                    await self.create_crc_file(sheet_index, ep, crc_file, mkv_crc32, chapters, episodes, release_date, length, False)
                 else:
                     logger.warning(f"Skipping {mkv_crc32[0]}.yml as archive file exists")
 
@@ -873,7 +1319,7 @@ class OnePaceMetadata:
                     crc_archive_file = Path(self.episodes_dir, "archive", f"{mkv_crc32_extended[0]}.yml")
 
                     if not crc_archive_file.is_file():
-                        self.create_crc_file(sheet_index, ep, crc_file, mkv_crc32_extended, chapters, episodes, release_date, length_extended, True)
+                        await self.create_crc_file(sheet_index, ep, crc_file, mkv_crc32_extended, chapters, episodes, release_date, length_extended, True)
                     else:
                         logger.warning(f"Skipping {mkv_crc32_extended[0]}.yml as archive file exists")
 
@@ -883,18 +1329,76 @@ class OnePaceMetadata:
         if poster != "":
             poster_file = Path(f"{self.arc_dir}/en/{sheet_index}/poster.png")
             if not poster_file.is_file():
-                with self.client.stream("GET", poster, follow_redirects=True) as poster_resp:
-                    cont_len = 0
-                    if "Content-Length" in poster_resp.headers:
-                        cont_len = int(poster_resp.headers["Content-Length"])
-                    elif "content-length" in poster_resp.headers:
-                        cont_len = int(poster_resp.headers["content-length"])
-
-                    if cont_len > 1024:
-                        with poster_file.open(mode='wb') as f:
-                            for chunk in poster_resp.iter_bytes():
-                                f.write(chunk)
-    
+                return (poster, poster_file, None)
+
+        return None
+
+    def load_episode_index(self):
+        self.episode_index = {}
+        self.episode_index_files = {}
+
+        yml_files = list(self.episodes_dir.rglob("*.yml")) if self.episodes_dir.is_dir() else []
+        for yml_file, (data, error) in zip(yml_files, self.read_yaml_many(yml_files)):
+            if error is not None:
+                logger.warning(f"Skipping {yml_file}: {error}")
+                continue
+
+            self.index_episode(yml_file, data)
+
+        logger.info(f"Indexed {len(self.episode_index_files)} episode files")
+
+    def index_episode(self, yml_file, data=None):
+        if self.episode_index is None:
+            return
+
+        self.unindex_episode(yml_file)
+
+        if data is None:
+            data = self.read_yaml(yml_file)
+
+        if not isinstance(data, dict):
+            return
+
+        key = (int(data.get("arc", 0)), int(data.get("episode", 0)))
+        entry = self.episode_index.setdefault(key, {"records": {}})
+        entry["records"][str(yml_file)] = data
+        self.episode_index_files[str(yml_file)] = key
+
+    def unindex_episode(self, yml_file):
+        if self.episode_index is None:
+            return None
+
+        key = self.episode_index_files.pop(str(yml_file), None)
+        if key is None:
+            return None
+
+        entry = self.episode_index[key]
+        data = entry["records"].pop(str(yml_file), None)
+
+        if len(entry["records"]) == 0:
+            del self.episode_index[key]
+
+        return data
+
+    def move_indexed_episode(self, src, target):
+        data = self.unindex_episode(src)
+        if data is not None:
+            self.index_episode(target, data)
+
+    def find_episode(self, arc, episode):
+        if self.episode_index is None:
+            self.load_episode_index()
+
+        entry = self.episode_index.get((int(arc), int(episode)), None)
+        if entry is None:
+            return None
+
+        # Current files take precedence over archived ones
+        for yml_file, data in sorted(entry["records"].items(), key=lambda x: Path(x[0]).parent.name == "archive"):
+            return (Path(yml_file), data)
+
+        return None
+
     def archive_file(self, src):
         archive_dir = Path(self.episodes_dir, "archive")
         if not archive_dir.is_dir():
@@ -903,16 +1407,10 @@ class OnePaceMetadata:
         stem = src.stem if hasattr(src, "stem") else src.name.split(".")[0]
         suffix = src.suffix if hasattr(src, "suffix") else ".yml"
     
-        pattern = re.compile(rf"^{re.escape(stem)}(?:_(\d+))?{re.escape(suffix)}$")
-        existing = []
-    
-        for f in archive_dir.iterdir():
-            if not f.is_file():
-                continue
-    
-            m = pattern.match(f.name)
-            if m:
-                existing.append(int(m.group(1) or 0))
+        if self.archive_versions is None:
+            self.load_archive_index()
+
+        existing = self.archive_versions.setdefault((stem, suffix), set())
     
         if len(existing) == 0:
             target = Path(archive_dir, src.name)
@@ -921,6 +1419,9 @@ class OnePaceMetadata:
                 src.move(target)
             except:
                 shutil.move(str(src), str(target))
+
+            self.move_indexed_episode(src, target)
+            existing.add(0)
             return
     
         max_n = max(existing)
@@ -929,16 +1430,48 @@ class OnePaceMetadata:
             original = Path(archive_dir, f"{stem}{suffix}")
             new_file = Path(archive_dir, f"{stem}_1{suffix}")
     
-            logger.info("---- Renaming {original} to: {new_file}")
+            logger.info(f"---- Renaming {original} to: {new_file}")
             original.rename(new_file)
+            self.move_indexed_episode(original, new_file)
             existing.remove(0)
-            existing.append(1)
+            existing.add(1)
     
             max_n = max(existing)
     
         target = Path(archive_dir, f"{stem}_{max_n + 1}{suffix}")
-        logger.info("---- Renaming {src} to: {target}")
+        logger.info(f"---- Renaming {src} to: {target}")
         src.rename(target)
+        self.move_indexed_episode(src, target)
+        existing.add(max_n + 1)
+
+    # Archived copies are named <stem>.yml, then <stem>_1.yml, <stem>_2.yml, ...
+    def load_archive_index(self):
+        self.archive_versions = {}
+        archive_dir = Path(self.episodes_dir, "archive")
+        pattern = re.compile(r"^(.+?)(?:_(\d+))?(\.[^.]+)$")
+
+        if not archive_dir.is_dir():
+            return
+
+        for f in archive_dir.iterdir():
+            if not f.is_file() or f.name.startswith("."):
+                continue
+
+            m = pattern.match(f.name)
+            if m:
+                self.archive_versions.setdefault((m.group(1), m.group(3)), set()).add(int(m.group(2) or 0))
+
+    def episode_data(self, yml_file):
+        if self.episode_index is None:
+            self.load_episode_index()
+
+        key = self.episode_index_files.get(str(yml_file), None)
+        if key is not None:
+            return self.episode_index[key]["records"][str(yml_file)]
+
+        data = self.read_yaml(yml_file)
+        self.index_episode(yml_file, data)
+        return data
 
     def compare_newer_crc_file(self, old, new):
         if len(old) < 8 or len(new) < 8 or old == new:
@@ -950,8 +1483,8 @@ class OnePaceMetadata:
         if not old_crc_file.is_file() or not new_crc_file.is_file():
             return False
 
-        old_crc_yml = self.read_yaml(old_crc_file)
-        new_crc_yml = self.read_yaml(new_crc_file)
+        old_crc_yml = self.episode_data(old_crc_file)
+        new_crc_yml = self.episode_data(new_crc_file)
 
         if int(old_crc_yml.get("arc", 0)) != int(new_crc_yml.get("arc", 0)) or int(old_crc_yml.get("episode", 0)) != int(new_crc_yml.get("episode", 0)):
             logger.warning(f"Arc/episode pairing wasn't the same! {old_crc_yml.get('arc', 0)}/{old_crc_yml.get('episode', 0)} :: {new_crc_yml.get('arc', 0)}/{new_crc_yml.get('episode', 0)}")
@@ -980,13 +1513,13 @@ class OnePaceMetadata:
 
         return False
 
-    def create_crc_file(self, sheet_index, ep, crc_file, mkv_crc32, chapters, episodes, release_date, length, extended):
+    async def create_crc_file(self, sheet_index, ep, crc_file, mkv_crc32, chapters, episodes, release_date, length, extended):
         if len(mkv_crc32) == 0 or mkv_crc32[0] == "" or str(crc_file).endswith("/.yml"):
             logger.warning(f"Did not save {crc_file} (mkv_crc32: {mkv_crc32}")
             return
 
         if mkv_crc32[1] != "":
-            file_info = self.fetch_file_info(mkv_crc32[1], search=f"[{mkv_crc32[0]}]")
+            file_info = await self.fetch_file_info(mkv_crc32[1], search=f"[{mkv_crc32[0]}]")
             file_dump = YamlDump({"file": file_info[0]}, allow_unicode=True, sort_keys=False) if len(file_info) > 0 else ""
         else:
             file_dump = ""
@@ -1009,9 +1542,10 @@ class OnePaceMetadata:
         )
 
         crc_file.write_text(out, encoding="utf-8")
+        self.index_episode(crc_file)
 
     def check_crc_file(self, sheet_index, ep, crc_file, mkv_crc32, chapters, episodes, release_date, length, extended):
-        yml_load = self.read_yaml(crc_file)
+        yml_load = self.episode_data(crc_file)
         changed = False
 
         if yml_load.get("arc", 0) != int(sheet_index):
@@ -1047,31 +1581,30 @@ class OnePaceMetadata:
                     .replace("\nhashes:", "\n\nhashes:"),
                 encoding="utf-8"
             )
+            self.index_episode(crc_file, yml_load)
 
-    def fetch_file_info(self, url, search=""):
-        is_url = False
-
+    async def fetch_file_info(self, url, search=""):
         if url in self.http_cache:
             logger.info(f"Retrieving cached item ({url})")
-            soup = BeautifulSoup(self.http_cache.get(url), "html.parser")
-        elif url.startswith("http"):
-            logger.info(f"Sending request to: {url}")
-            resp = httpx.get(url)
-
-            if 'location' in resp.headers:
-                old_url = f"{url}"
-                url = resp.headers['location']
-                logger.info(f"Redirected to: {url}")
-                resp = httpx.get(url)
-                self.set_cache(old_url, resp.text)
-
-            self.set_cache(url, resp.text)
-            soup = BeautifulSoup(resp.text, "html.parser")
-            is_url = True
+            text, final_url = self.http_cache[url]
         else:
-            soup = BeautifulSoup(url, "html.parser")
+            logger.info(f"Sending request to: {url}")
+            resp = await self.fetch(url)
+            final_url = str(resp.url)
+
+            if final_url != url:
+                logger.info(f"Redirected to: {final_url}")
+
+            text = resp.text
+            self.set_cache(url, (text, final_url))
+
+        return self.parse_file_info(text, final_url, search)
 
-        if is_url and "/view/" in url:
+    def parse_file_info(self, text, url="", search=""):
+        soup = BeautifulSoup(text, "html.parser")
+        file_id = 0
+
+        if "/view/" in url:
             file_id = int(url.split("/view/")[1])
         else:
             clearfix = soup.find("div", class_="clearfix")
@@ -1127,32 +1660,62 @@ class OnePaceMetadata:
 
         return files
 
-    def update_from_rss_feed(self, rss_feed_url):
+    async def update_from_rss_feed(self, rss_feed_url):
         if len(self.arc_to_num) == 0:
             self.load_arcs()
 
-        resp = self.client.get(rss_feed_url, follow_redirects=True)
+        resp = await self.fetch(rss_feed_url)
 
         title_pattern = re.compile(r'\[(?:One Pace)?\]\[\d+(?:[-,]\d+)*\]\s+(.+?)(?:\s+(\d{2,})(?:\s+(.+?))?)?\s+\[\d+p\](?:\[[^\]]+\])*\[([A-Fa-f0-9]{8})\]\.(?:mkv|mp4)', re.IGNORECASE)
         now = datetime.now(tz=timezone.utc)
         added_metadata = []
         _arc_cache = None
         _desc_cache = None
+        items = []
 
-        for i, item in enumerate(RSSParser.parse(resp.text).channel.items):
-            if i == 25:
-                break
+        # Anything published after the watermark is still processed when it is
+        # older than oldest_rss_release_hours, so missed runs are caught up
+        state = self.load_rss_state()
+        oldest = now - timedelta(hours=int(self.config["oldest_rss_release_hours"]))
+        watermark = datetime.fromisoformat(state["last_pub_date"]) if state["last_pub_date"] != "" else None
+        if watermark is not None and watermark < oldest:
+            oldest = watermark
 
+        skipped = 0
+        pending = []
+
+        for item in RSSParser.parse(resp.text).channel.items:
             if not item.title or not item.title.content or item.title.content == "":
                 continue
 
             pub_date = datetime.strptime(item.pub_date.content, "%a, %d %b %Y %H:%M:%S %z")
-            if (now - pub_date).total_seconds() > (int(self.config["oldest_rss_release_hours"]) * 3600):
+            if pub_date < oldest:
                 continue
 
-            logger.info(f"Processing new release from: {item.guid.content}")
-            resp = self.client.get(item.guid.content, follow_redirects=True)
-            files = self.fetch_file_info(resp.text)
+            if item.guid.content in state["seen"]:
+                skipped += 1
+                continue
+
+            if len(items) == 25:
+                pending.append(pub_date)
+                break
+
+            items.append((item, pub_date))
+
+        if skipped > 0:
+            logger.info(f"Skipped {skipped} already processed releases")
+
+        all_resp = await self.fetch_all([item.guid.content for item, _ in items])
+
+        for (item, pub_date), resp in zip(items, all_resp):
+            logger.info(f"Processing new release from: {item.guid.content}")
+            if isinstance(resp, Exception):
+                logger.error(f"-- Skipping: {resp}")
+                pending.append(pub_date)
+                continue
+
+            state["seen"][item.guid.content] = pub_date.isoformat()
+            files = self.parse_file_info(resp.text)
             only_file = len(files) == 1
 
             for mkv_file in files:
@@ -1199,8 +1762,10 @@ class OnePaceMetadata:
 
                     _special_title = arc_name.split(" (")[0].lower()
                     if _desc_cache is None:
-                        _desc_cache = self.generate_desc()
+                        _desc_cache = self.generate_descriptions()
                         if "en" not in _desc_cache:
+                            state["seen"].pop(item.guid.content, None)
+                            pending.append(pub_date)
                             continue
                         else:
                             _desc_cache = _desc_cache["en"]
@@ -1230,6 +1795,8 @@ class OnePaceMetadata:
                     if _arc_cache is None:
                         _arc_cache = self.generate_arcs()
                         if "en" not in _arc_cache:
+                            state["seen"].pop(item.guid.content, None)
+                            pending.append(pub_date)
                             continue
                         else:
                             _arc_cache = _arc_cache["en"]
@@ -1256,6 +1823,8 @@ class OnePaceMetadata:
                         added_metadata.append(f"Specials: {arc_name}{_old_ep_num}{extra_str} ({crc32})")
                     elif arc_num == 0 and ep_num != "":
                         logger.info("---- Wait on metadata to become available in ep guide/desc")
+                        state["seen"].pop(item.guid.content, None)
+                        pending.append(pub_date)
                         continue
                     else:
                         added_metadata.append(f"{arc_name} {ep_num}{extra_str} ({crc32})")
@@ -1272,8 +1841,10 @@ class OnePaceMetadata:
                     if not arc_file.parent.is_dir():
                         arc_file.parent.mkdir(exist_ok=True)
 
+                    config_yml = None
+
                     if arc_file.is_file():
-                        config_yml = self.read_yaml(arc_file)
+                        config_yml = self.load_doc(arc_file)
 
                         i = None
                         for ind, ep_item in enumerate(config_yml["episodes"]):
@@ -1318,10 +1889,9 @@ class OnePaceMetadata:
                             }]
                         )
 
-                    arc_file.write_text(
-                        YamlDump(config_yml, allow_unicode=True, sort_keys=False).replace("\ninfo:\n", "\n\ninfo:\n").replace("\nepisodes:\n", "\n\nepisodes:\n"),
-                        encoding="utf-8"
-                    )
+                    # Neither loaded nor created: a new arc without an episode number
+                    if config_yml is not None:
+                        self.save_doc(arc_file, config_yml, self.dump_arc_yaml)
 
                 chapters = ""
                 episodes = ""
@@ -1338,14 +1908,13 @@ class OnePaceMetadata:
                 ep_num_i = int(ep_num) if ep_num != "" else 1
 
                 if chapters == "" and episodes == "":
-                    for yml_file in self.episodes_dir.rglob("*.yml"):
-                        data = self.read_yaml(yml_file)
+                    found = self.find_episode(arc_num, ep_num_i)
 
-                        if data["arc"] == arc_num and data["episode"] == ep_num_i:
-                            logger.info(f"Using chapters/episodes from: {yml_file}")
-                            chapters = data["manga_chapters"]
-                            episodes = data["anime_episodes"]
-                            break
+                    if found is not None:
+                        yml_file, data = found
+                        logger.info(f"Using chapters/episodes from: {yml_file}")
+                        chapters = data.get("manga_chapters", "")
+                        episodes = data.get("anime_episodes", "")
 
                 meta = {
                     "manga_chapters": chapters,
@@ -1383,6 +1952,19 @@ class OnePaceMetadata:
                 logger.info(f"Writing to: {crc_file}")
                 crc_file.unlink(missing_ok=True)
                 crc_file.write_text(out, encoding="utf-8")
+                self.index_episode(crc_file)
+
+        # The watermark never moves past a release that still has to be retried
+        seen_dates = [datetime.fromisoformat(d) for d in state["seen"].values()]
+        if len(pending) > 0:
+            seen_dates = [d for d in seen_dates if d < min(pending)]
+        if watermark is not None:
+            seen_dates.append(watermark)
+        if len(seen_dates) > 0:
+            state["last_pub_date"] = max(seen_dates).isoformat()
+
+        state["seen"] = {guid: d for guid, d in state["seen"].items() if datetime.fromisoformat(d) >= oldest}
+        self.save_rss_state(state)
 
         if len(added_metadata) > 0:
             print(f"Add metadata: {', '.join(added_metadata)}")
@@ -1391,19 +1973,76 @@ class OnePaceMetadata:
 
         return True
 
-    def generate_arcs(self):
-        arcs = {}
+    def corpus_files(self, section):
+        if section == "arcs" or section == "descriptions":
+            pattern = "config.yml" if section == "arcs" else "episode_*.yml"
+
+            for lang_folder in self.arc_dir.iterdir():
+                if not lang_folder.is_dir():
+                    continue
+
+                yield (lang_folder.name, None)
+                for yml in lang_folder.rglob(pattern):
+                    yield (lang_folder.name, yml)
+
+        elif section == "episodes":
+            for yml in self.episodes_dir.rglob("*.yml"):
+                yield (yml.parent.name == "archive", yml)
+
+        elif section == "other_edits":
+            for edit_dir in self.other_edits_dir.iterdir():
+                if not edit_dir.is_dir():
+                    continue
+
+                yield (edit_dir.name, None)
+                for yml in edit_dir.rglob("*.yml"):
+                    yield (edit_dir.name, yml)
 
-        for lang_folder in self.arc_dir.iterdir():
-            if not lang_folder.is_dir():
+    def load_corpus(self, *sections):
+        self.flush_docs()
+
+        files = []
+        for section in sections if len(sections) > 0 else ("arcs", "descriptions", "episodes", "other_edits"):
+            if section in self.corpus:
                 continue
 
-            lang = lang_folder.name
+            self.corpus[section] = [] if section == "episodes" else {}
+            for key, yml in self.corpus_files(section):
+                files.append((section, key, yml))
+
+        results = iter(self.read_yaml_many([yml for section, key, yml in files if yml is not None]))
+
+        for section, key, yml in files:
+            items = self.corpus[section]
+            if section != "episodes" and key not in items:
+                items[key] = []
+
+            if yml is None:
+                continue
+
+            data, error = next(results)
+            if error is not None:
+                if section != "other_edits":
+                    raise ValueError(f"Unable to parse {yml}: {error}")
+
+                logger.error(f"Skipping: Cannot read {yml}: {error}")
+                continue
+
+            if section == "episodes":
+                items.append((key, yml, data))
+            else:
+                items[key].append((yml, data))
+
+        return self.corpus
+
+    def generate_arcs(self):
+        arcs = {}
+
+        for lang, configs in self.load_corpus("arcs")["arcs"].items():
             arcs[lang] = []
-            data = {}
 
-            for config_yml in lang_folder.rglob("config.yml"):
-                data = self.read_yaml(config_yml)
+            for config_yml, data in configs:
+                data = dict(data)
                 data["description"] = data.get("description", "").strip()
                 arcs[lang].append(data)
 
@@ -1414,14 +2053,10 @@ class OnePaceMetadata:
         desc = {}
         pattern = re.compile(r"episode_(\d+)\.yml$")
 
-        for lang_folder in self.arc_dir.iterdir():
-            if not lang_folder.is_dir():
-                continue
-
-            lang = lang_folder.name
+        for lang, ep_ymls in self.load_corpus("descriptions")["descriptions"].items():
             desc[lang] = []
 
-            for ep_yml in lang_folder.rglob("episode_*.yml"):
+            for ep_yml, ep_data in ep_ymls:
                 data = {"arc": int(ep_yml.parent.name)}
 
                 m = pattern.search(ep_yml.name)
@@ -1430,7 +2065,7 @@ class OnePaceMetadata:
                 else:
                     data["episode"] = ""
 
-                for k, v in self.read_yaml(ep_yml).items():
+                for k, v in ep_data.items():
                     data[k] = v
 
                 desc[lang].append(data)
@@ -1441,13 +2076,13 @@ class OnePaceMetadata:
 
     def generate_episodes(self, for_json=True, exclude_archived=True):
         episodes = {}
-        for yml in self.episodes_dir.rglob("*.yml"):
-            if yml.parent.name == "archive" and exclude_archived:
+        for archived, yml, data in self.load_corpus("episodes")["episodes"]:
+            if archived and exclude_archived:
                 continue
 
             crc32 = yml.stem
 
-            data = self.read_yaml(yml)
+            data = dict(data)
             data["manga_chapters"] = str(data.get("manga_chapters", ""))
             data["anime_episodes"] = str(data.get("anime_episodes", ""))
 
@@ -1455,7 +2090,7 @@ class OnePaceMetadata:
                 data["duration"] = int(data["duration"])
 
             if not exclude_archived:
-                data["archived"] = 1 if yml.parent.name == "archive" else 0
+                data["archived"] = 1 if archived else 0
 
             if "released" in data:
                 if for_json:
@@ -1475,6 +2110,9 @@ class OnePaceMetadata:
                     else:
                         episodes[crc32] = [data]
 
+            elif archived and crc32 in episodes:
+                # A re-release can keep the CRC32 of its archived copy, the live one wins
+                continue
             else:
                 episodes[crc32] = data
 
@@ -1486,16 +2124,15 @@ class OnePaceMetadata:
     def generate_other_edits(self, for_json=True):
         other_edits = {}
 
-        for edit_dir in self.other_edits_dir.iterdir():
-            if not edit_dir.is_dir():
-                continue
-
-            e_id = edit_dir.name
+        for e_id, ymls in self.load_corpus("other_edits")["other_edits"].items():
             other_edits[e_id] = {}
 
-            for yml in edit_dir.rglob("*.yml"):
+            for yml, data in ymls:
                 try:
-                    data = self.read_yaml(yml)
+                    data = dict(data)
+                    if "hashes" in data:
+                        data["hashes"] = dict(data["hashes"])
+
                     data["manga_chapters"] = str(data.get("manga_chapters", ""))
                     data["anime_episodes"] = str(data.get("anime_episodes", ""))
 
@@ -1625,224 +2262,724 @@ class OnePaceMetadata:
     #    if meta_series_file.parent.is_dir():
     #        meta_series_file.write_text(json.dumps(meta, indent=2, default=self.serialize_json))
 
-    def generate_sqlite(self, data_file, arcs, episodes, descriptions, status, tvshow, other_edits, with_posters=False):
-        with sqlite3.connect(data_file, timeout=15.0) as conn:
+    def sqlite_rows(self, arcs, episodes, descriptions, status, tvshow, other_edits):
+        rows = {
+            "arcs": [],
+            "arc_episodes": [],
+            "arc_info": [],
+            "descriptions": [],
+            "episodes": [],
+            "status": [],
+            "tvshow": [],
+            "other_edits": []
+        }
+
+        for arc_lang, arc_item in arcs.items():
+            for arc in arc_item:
+                if arc.get("part", "") == "":
+                    continue
+
+                rows["arcs"].append((
+                    arc_lang,
+                    arc.get("part", 0),
+                    arc.get("saga", ""),
+                    arc.get("title", ""),
+                    arc.get("originaltitle", ""),
+                    arc.get("shortcode", ""),
+                    arc.get("mkvcode", ""),
+                    arc.get("description", ""),
+                    None
+                ))
+
+                for ep in arc.get("episodes", []):
+                    rows["arc_episodes"].append((
+                        arc.get("part", 0),
+                        ep.get("episode", ""),
+                        ep.get("standard", ""),
+                        ep.get("extended", "")
+                    ))
+
+                info = arc.get("info", {})
+
+                rows["arc_info"].append((
+                    arc.get("part", 0),
+                    arc_lang,
+                    info.get("status", ""),
+                    info.get("manga_chapters", ""),
+                    info.get("num_of_chapters", 0),
+                    info.get("anime_episodes", ""),
+                    info.get("episodes_adapted", 0),
+                    info.get("filler_episodes", ""),
+                    info.get("num_of_pace_eps", 0),
+                    info.get("piece_minutes", 0),
+                    info.get("pace_minutes", 0),
+                    info.get("audio_languages", ""),
+                    info.get("sub_languages", ""),
+                    info.get("pixeldrain_only", ""),
+                    info.get("resolution", ""),
+                    info.get("arc_watch_guide", "")
+                ))
+
+        for desc_lang, desc_item in descriptions.items():
+            for desc in desc_item:
+                rows["descriptions"].append((
+                    desc_lang,
+                    desc.get("arc", 0),
+                    desc.get("episode", 0),
+                    desc.get("title", ""),
+                    desc.get("originaltitle", ""),
+                    desc.get("description", "")
+                ))
+
+        for crc32, all_eps in episodes.items():
+            total_eps = [all_eps] if isinstance(all_eps, dict) else all_eps
+
+            for episode in total_eps:
+                hashes = episode.get("hashes", {})
+                file = episode.get("file", {})
+                released = episode.get("released", "")
+
+                rows["episodes"].append((
+                    episode.get("arc", 0),
+                    episode.get("episode", 0),
+                    episode.get("manga_chapters", ""),
+                    episode.get("anime_episodes", ""),
+                    self.datetime_serialize(released),
+                    int(episode.get("duration", 0)),
+                    1 if episode.get("extended", False) else 0,
+                    1 if episode.get("archived", False) else 0,
+                    str(hashes.get("crc32", "")).upper(),
+                    str(hashes.get("blake2s", "")).lower(),
+                    file.get("id", 0),
+                    file.get("name", ""),
+                    file.get("size", ""),
+                    file.get("hash", ""),
+                    file.get("index", 0)
+                ))
+
+        rows["status"].append((
+            status["last_update"],
+            status["last_update_ts"],
+            status["base_url"],
+            status["version"]
+        ))
+
+        for show_lang, show_items in tvshow.items():
+            for k, v in show_items.items():
+                if isinstance(v, list):
+                    for item in v:
+                        rows["tvshow"].append((show_lang, str(k), str(item)))
+                elif isinstance(v, bool):
+                    rows["tvshow"].append((show_lang, str(k), "true" if v else "false"))
+                elif isinstance(v, datetime) or isinstance(v, date):
+                    rows["tvshow"].append((show_lang, str(k), self.datetime_serialize(v)))
+                else:
+                    rows["tvshow"].append((show_lang, str(k), str(v)))
+
+        for edit_name, b2 in other_edits.items():
+            for ep in b2.values():
+                hashes = ep.get("hashes", {})
+                released = ep.get("released", "")
+
+                rows["other_edits"].append((
+                    edit_name,
+                    ep.get("arc", 0),
+                    ep.get("episode", 0),
+                    ep.get("title", ""),
+                    ep.get("description", ""),
+                    ep.get("manga_chapters", ""),
+                    ep.get("anime_episodes", ""),
+                    self.datetime_serialize(released),
+                    ep.get("duration", 0),
+                    ep.get("extended", False),
+                    str(hashes.get("crc32", "")).upper(),
+                    str(hashes.get("blake2", "")).lower()
+                ))
+
+        return rows
+
+    def sqlite_columns(self):
+        return {
+            "arcs": ("lang", "part", "saga", "title", "originaltitle", "shortcode", "mkvcode", "description", "poster"),
+            "arc_episodes": ("arc_part", "episode", "standard", "extended"),
+            "arc_info": ("arc_part", "lang", "status", "manga_chapters", "num_of_chapters", "anime_episodes", "episodes_adapted",
+                "filler_episodes", "num_of_pace_eps", "piece_minutes", "pace_minutes", "audio_languages", "sub_languages",
+                "pixeldrain_only", "resolution", "arc_watch_guide"),
+            "descriptions": ("lang", "arc", "episode", "title", "originaltitle", "description"),
+            "episodes": ("arc", "episode", "manga_chapters", "anime_episodes", "released", "duration", "extended",
+                "archived", "hash_crc32", "hash_blake2s", "file_id", "file_name", "file_size", "file_hash", "file_index"),
+            "status": ("last_update", "last_update_ts", "base_url", "version"),
+            "tvshow": ("lang", "key", "value"),
+            "other_edits": ("edit_name", "arc", "episode", "title", "description", "manga_chapters", "anime_episodes",
+                "released", "duration", "extended", "hash_crc32", "hash_blake2s")
+        }
+
+    def sqlite_indexes(self):
+        return [
+            "CREATE INDEX IF NOT EXISTS idx_arcs_lang ON arcs(lang);",
+            "CREATE INDEX IF NOT EXISTS idx_arcs_lang_part ON arcs(lang, part);",
+            "CREATE INDEX IF NOT EXISTS idx_episodes_crc32 ON episodes(hash_crc32);",
+            "CREATE INDEX IF NOT EXISTS idx_episodes_blake2s ON episodes(hash_blake2s);",
+            "CREATE INDEX IF NOT EXISTS idx_other_edits_edit_name ON other_edits(edit_name);",
+            "CREATE INDEX IF NOT EXISTS idx_other_edits_crc32 ON other_edits(hash_crc32, edit_name);",
+            "CREATE INDEX IF NOT EXISTS idx_other_edits_blake2s ON other_edits(hash_blake2s, edit_name);"
+        ]
+
+    def sqlite_posters(self, arcs):
+        posters = []
+
+        for arc_lang, arc_item in arcs.items():
+            for arc in arc_item:
+                if arc.get("part", "") == "":
+                    continue
+
+                poster_path = Path(self.arc_dir, arc_lang, str(arc["part"]), "poster.png")
+                if poster_path.is_file():
+                    try:
+                        posters.append((poster_path.read_bytes(), arc_lang, arc["part"]))
+                    except:
+                        logger.exception("Skipping fetching poster")
+
+        return posters
+
+    def generate_sqlite(self, data_file, rows):
+        Path(data_file).unlink(missing_ok=True)
+        conn = sqlite3.connect(data_file, timeout=15.0, isolation_level=None)
+
+        try:
             cursor = conn.cursor()
+            cursor.execute("PRAGMA journal_mode = OFF;")
+            cursor.execute("PRAGMA synchronous = OFF;")
+            cursor.execute("PRAGMA cache_size = -65536;")
+            cursor.execute("PRAGMA temp_store = MEMORY;")
+            cursor.execute("BEGIN;")
 
             schema_tables = Path("./schema.sql").read_text().split(";\n")
             for table in schema_tables:
                 cursor.execute(table)
-                conn.commit()
 
-            for arc_lang, arc_item in arcs.items():
-                for arc in arc_item:
-                    if arc.get("part", "") == "":
-                        continue
+            for table, columns in self.sqlite_columns().items():
+                cursor.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    rows[table]
+                )
 
-                    poster_blob = None
-                    poster_path = Path(self.arc_dir, arc_lang, str(arc["part"]), "poster.png")
-                    if with_posters and poster_path.is_file():
-                        try:
-                            poster_blob = poster_path.read_bytes()
-                        except:
-                            logger.exception("Skipping fetching poster")
-
-                    cursor.execute(
-                        "INSERT INTO arcs (lang, part, saga, title, " + 
-                        "originaltitle, shortcode, mkvcode, description, poster) " +
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        (arc_lang,
-                        arc.get("part", 0),
-                        arc.get("saga", ""),
-                        arc.get("title", ""),
-                        arc.get("originaltitle", ""),
-                        arc.get("shortcode", ""),
-                        arc.get("mkvcode", ""),
-                        arc.get("description", ""),
-                        poster_blob)
-                    )
-
-                    conn.commit()
-
-                    for ep in arc.get("episodes", []):
-                        cursor.execute(
-                            "INSERT INTO arc_episodes (arc_part, episode, standard, extended) " +
-                            "VALUES (?, ?, ?, ?)",
-                            (arc.get("part", 0),
-                            ep.get("episode", ""),
-                            ep.get("standard", ""),
-                            ep.get("extended", ""))
-                        )
+            for index in self.sqlite_indexes():
+                cursor.execute(index)
 
-                    info = arc.get("info", {})
-
-                    cursor.execute(
-                        "INSERT INTO arc_info (arc_part, status, manga_chapters, " +
-                        "num_of_chapters, anime_episodes, episodes_adapted, filler_episodes," +
-                        "num_of_pace_eps, piece_minutes, pace_minutes, audio_languages, " +
-                        "sub_languages, pixeldrain_only, resolution, arc_watch_guide) " +
-                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        (arc.get("part", 0),
-                        info.get("status", ""),
-                        info.get("manga_chapters", ""),
-                        info.get("num_of_chapters", 0),
-                        info.get("anime_episodes", ""),
-                        info.get("episodes_adapted", 0),
-                        info.get("filler_episodes", ""),
-                        info.get("num_of_pace_eps", 0),
-                        info.get("piece_minutes", 0),
-                        info.get("pace_minutes", 0),
-                        info.get("audio_languages", ""),
-                        info.get("sub_languages", ""),
-                        info.get("pixeldrain_only", ""),
-                        info.get("resolution", ""),
-                        info.get("arc_watch_guide", ""))
-                    )
-
-                    conn.commit()
-
-            for desc_lang, desc_item in descriptions.items():
-                for desc in desc_item:
-                    cursor.execute(
-                        "INSERT INTO descriptions (lang, arc, episode, title, " +
-                        "originaltitle, description) VALUES (?, ?, ?, ?, ?, ?)",
-                        (desc_lang,
-                        desc.get("arc", 0),
-                        desc.get("episode", 0),
-                        desc.get("title", ""),
-                        desc.get("originaltitle", ""),
-                        desc.get("description", ""))
-                    )
-
-            conn.commit()
-
-            for crc32, all_eps in episodes.items():
-                total_eps = [all_eps] if isinstance(all_eps, dict) else all_eps
-
-                for episode in total_eps:
-                    hashes = episode.get("hashes", {})
-                    file = episode.get("file", {})
-                    released = episode.get("released", "")
-
-                    cursor.execute("INSERT INTO episodes (arc, episode, manga_chapters, " +
-                        "anime_episodes, released, duration, extended, archived, hash_crc32, " +
-                        "hash_blake2s, file_id, file_name, file_size, file_hash, " +
-                        "file_index) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        (episode.get("arc", 0),
-                        episode.get("episode", 0),
-                        episode.get("manga_chapters", ""),
-                        episode.get("anime_episodes", ""),
-                        self.datetime_serialize(released),
-                        int(episode.get("duration", 0)),
-                        1 if episode.get("extended", False) else 0,
-                        1 if episode.get("archived", False) else 0,
-                        str(hashes.get("crc32", "")).upper(),
-                        str(hashes.get("blake2s", "")).lower(),
-                        file.get("id", 0),
-                        file.get("name", ""),
-                        file.get("size", ""),
-                        file.get("hash", ""),
-                        file.get("index", 0))
-                )
+            cursor.execute("COMMIT;")
+        finally:
+            conn.close()
+
+    def sqlite_keys(self):
+        return {
+            "arcs": ("lang", "part"),
+            "arc_episodes": ("arc_part", "episode"),
+            "arc_info": ("arc_part", "lang"),
+            "descriptions": ("lang", "arc", "episode"),
+            "episodes": ("hash_crc32",),
+            "status": (),
+            "tvshow": ("lang", "key"),
+            "other_edits": ("edit_name", "hash_blake2s")
+        }
 
-            conn.commit()
+    def sqlite_rows_with_posters(self, rows, posters):
+        poster_map = {(lang, part): blob for blob, lang, part in posters}
 
-            cursor.execute("INSERT INTO status (last_update, last_update_ts, base_url, version) " +
-                "VALUES (?, ?, ?, ?)",
-                (status["last_update"],
-                status["last_update_ts"],
-                status["base_url"],
-                status["version"])
-            )
+        rows = dict(rows)
+        rows["arcs"] = [row[:-1] + (poster_map.get((row[0], row[1]), None),) for row in rows["arcs"]]
+        return rows
 
-            query = "INSERT INTO tvshow (lang, key, value) VALUES (?, ?, ?)"
-            for show_lang, show_items in tvshow.items():
-                for k, v in show_items.items():
-                    if isinstance(v, list):
-                        for item in v:
-                            cursor.execute(query, (show_lang, str(k), str(item)))
-                    elif isinstance(v, bool):
-                        cursor.execute(query, (show_lang, str(k), "true" if v else "false"))
-                    elif isinstance(v, datetime) or isinstance(v, date):
-                        cursor.execute(query, (show_lang, str(k), self.datetime_serialize(v)))
-                    else:
-                        cursor.execute(query, (show_lang, str(k), str(v)))
-
-            conn.commit()
-
-            for edit_name, b2 in other_edits.items():
-                for ep in b2.values():
-                    hashes = ep.get("hashes", {})
-                    released = ep.get("released", "")
-
-                    cursor.execute("INSERT INTO other_edits (edit_name, arc, " +
-                        "episode, title, description, manga_chapters, " +
-                        "anime_episodes, released, duration, extended, " +
-                        "hash_crc32, hash_blake2s) VALUES (?, ?, ?, " +
-                        "?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                        (
-                            edit_name,
-                            ep.get("arc", 0),
-                            ep.get("episode", 0),
-                            ep.get("title", ""),
-                            ep.get("description", ""),
-                            ep.get("manga_chapters", ""),
-                            ep.get("anime_episodes", ""),
-                            self.datetime_serialize(released),
-                            ep.get("duration", 0),
-                            ep.get("extended", False),
-                            str(hashes.get("crc32", "")).upper(),
-                            str(hashes.get("blake2", "")).lower()
-                        )
-                    )
-
-            conn.commit()
-
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_arcs_lang ON arcs(lang);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_arcs_lang_part ON arcs(lang, part);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_episodes_crc32 ON episodes(hash_crc32);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_episodes_blake2s ON episodes(hash_blake2s);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_other_edits_edit_name ON other_edits(edit_name);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_other_edits_crc32 ON other_edits(hash_crc32, edit_name);")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_other_edits_blake2s ON other_edits(hash_blake2s, edit_name);")
-
-            conn.commit()
-
-    def generate_data(self):
-        logger.info("Generate arcs")
-        arcs = self.generate_arcs()
-        Path(self.metadata_dir, "arcs.json").write_text(json.dumps(arcs, indent=2, default=self.serialize_json))
-        Path(self.metadata_dir, "arcs.min.json").write_text(json.dumps(arcs, separators=(',', ':'), default=self.serialize_json))
-        self.write_yaml(Path(self.metadata_dir, "arcs.yml"), arcs)
-
-        logger.info("Generate descriptions")
-        descriptions = self.generate_descriptions()
-        Path(self.metadata_dir, "descriptions.json").write_text(json.dumps(descriptions, indent=2, default=self.serialize_json))
-        Path(self.metadata_dir, "descriptions.min.json").write_text(json.dumps(descriptions, separators=(',', ':'), default=self.serialize_json))
-        self.write_yaml(Path(self.metadata_dir, "descriptions.yml"), descriptions)
-
-        logger.info("Generate episodes")
-        episodes = self.generate_episodes(for_json=True)
-        episodes_yml = self.generate_episodes(for_json=False)
-        Path(self.metadata_dir, "episodes.json").write_text(json.dumps(episodes, indent=2, default=self.serialize_json))
-        Path(self.metadata_dir, "episodes.min.json").write_text(json.dumps(episodes, separators=(',', ':'), default=self.serialize_json))
-        self.write_yaml(Path(self.metadata_dir, "episodes.yml"), episodes_yml)
+    def update_sqlite(self, data_file, rows):
+        conn = sqlite3.connect(data_file, timeout=15.0, isolation_level=None)
+        keys = self.sqlite_keys()
+        inserted = updated = deleted = 0
+        status_changed = False
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA synchronous = OFF;")
+            cursor.execute("PRAGMA temp_store = MEMORY;")
+            cursor.execute("BEGIN;")
+
+            for table, columns in self.sqlite_columns().items():
+                column_list = ", ".join(columns)
+                placeholders = ", ".join("?" * len(columns))
+                key_index = [columns.index(k) for k in keys[table]]
+
+                # Round-trip the new rows through a temp table with the same column affinity,
+                # so they compare equal to what is already stored
+                cursor.execute(f"CREATE TEMP TABLE new_{table} AS SELECT {column_list} FROM main.{table} WHERE 0;")
+                cursor.executemany(f"INSERT INTO new_{table} ({column_list}) VALUES ({placeholders})", rows[table])
+                new_rows = cursor.execute(f"SELECT {column_list} FROM new_{table} ORDER BY rowid").fetchall()
+                cursor.execute(f"DROP TABLE new_{table};")
+
+                existing = {}
+                for row in cursor.execute(f"SELECT id, {column_list} FROM main.{table} ORDER BY id").fetchall():
+                    existing.setdefault(tuple(row[1 + i] for i in key_index), []).append((row[0], row[1:]))
+
+                pending = {}
+                for row in new_rows:
+                    pending.setdefault(tuple(row[i] for i in key_index), []).append(row)
+
+                inserts = []
+                updates = []
+                deletes = []
+
+                for key, new_items in pending.items():
+                    old_items = existing.pop(key, [])
+                    unmatched = []
+
+                    for row in new_items:
+                        for i, (row_id, old_row) in enumerate(old_items):
+                            if old_row == row:
+                                del old_items[i]
+                                break
+                        else:
+                            unmatched.append(row)
+
+                    for row in unmatched:
+                        if len(old_items) > 0:
+                            row_id, _ = old_items.pop(0)
+                            updates.append(row + (row_id,))
+                        else:
+                            inserts.append(row)
+
+                    deletes.extend((row_id,) for row_id, _ in old_items)
+
+                for old_items in existing.values():
+                    deletes.extend((row_id,) for row_id, _ in old_items)
+
+                cursor.executemany(f"DELETE FROM {table} WHERE id = ?", deletes)
+                cursor.executemany(f"UPDATE {table} SET ({column_list}) = ({placeholders}) WHERE id = ?", updates)
+                cursor.executemany(f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})", inserts)
+
+                # The status row carries the build time and changes on every rebuild
+                if table == "status":
+                    status_changed = len(inserts) + len(updates) + len(deletes) > 0
+                    continue
+
+                inserted += len(inserts)
+                updated += len(updates)
+                deleted += len(deletes)
+
+            cursor.execute("COMMIT;")
+        except:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK;")
+            raise
+        finally:
+            conn.close()
+
+        logger.info(f"-- {data_file}: {inserted} inserted, {updated} updated, {deleted} deleted" + (", status updated" if status_changed else ""))
+
+    def generate_sqlite_posters(self, data_file, posters_file, posters):
+        shutil.copyfile(data_file, posters_file)
+        conn = sqlite3.connect(posters_file, timeout=15.0, isolation_level=None)
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA journal_mode = OFF;")
+            cursor.execute("PRAGMA synchronous = OFF;")
+            cursor.execute("BEGIN;")
+            cursor.executemany("UPDATE arcs SET poster = ? WHERE lang = ? AND part = ?", posters)
+            cursor.execute("COMMIT;")
+        finally:
+            conn.close()
+
+    # Duplicate CRC32s are stored as a list, this yields one record per episode
+    def episode_records(self, file_path, episodes):
+        for crc32, all_eps in episodes.items():
+            try:
+                key = int(crc32, 16)
+            except ValueError:
+                logger.warning(f"Skipping {crc32} in {file_path.name}: not a CRC32")
+                continue
+
+            for episode in [all_eps] if isinstance(all_eps, dict) else all_eps:
+                yield (key, episode)
+
+    def generate_episode_index(self, file_path, episodes):
+        records = []
+
+        for crc32, all_eps in episodes.items():
+            if not isinstance(all_eps, dict):
+                logger.warning(f"{crc32} in {file_path.name} has {len(all_eps)} records, EpisodeIndex.get returns only the first (use get_all)")
+
+        for key, episode in self.episode_records(file_path, episodes):
+            hashes = episode.get("hashes", {})
+            file = episode.get("file", None)
+            flags = (1 if episode.get("extended", False) else 0) | (2 if isinstance(file, dict) else 0)
+            file = file if isinstance(file, dict) else {}
+
+            record = bytearray(struct.pack(
+                EpisodeIndex.RECORD,
+                int(episode.get("arc", 0)),
+                int(episode.get("episode", 0)),
+                flags,
+                int(episode.get("duration", 0)),
+                int(file.get("id", None) or 0),
+                int(file.get("index", None) or 0)
+            ))
+
+            for value in (
+                self.datetime_serialize(episode.get("released", "")),
+                episode.get("manga_chapters", ""),
+                episode.get("anime_episodes", ""),
+                str(hashes.get("blake2s", "")),
+                file.get("name", ""),
+                file.get("size", ""),
+                file.get("hash", "")
+            ):
+                value = str(value).encode("utf-8")
+                record += struct.pack("<H", len(value)) + value
+
+            records.append((key, bytes(record)))
+
+        records.sort(key=lambda x: x[0])
+
+        keys = struct.pack(f"<{len(records)}I", *(key for key, _ in records))
+        offsets = []
+        offset = 0
+        for _, record in records:
+            offsets.append(offset)
+            offset += len(record)
+
+        header = struct.pack(EpisodeIndex.HEADER, EpisodeIndex.MAGIC, len(records), struct.calcsize(EpisodeIndex.HEADER) + len(keys) * 2)
+        self.write_atomic(file_path, header + keys + struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(record for _, record in records))
+
+    def epoch(self, dt):
+        dt = self.datetime_unserialize(dt)
+
+        if isinstance(dt, datetime):
+            return round((dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)).timestamp())
+        elif isinstance(dt, date):
+            return round(datetime(dt.year, dt.month, dt.day, tzinfo=timezone.utc).timestamp())
+
+        return 0
+
+    # One array per field instead of one object per episode. Bitsets are
+    # base64 with episode i at bit (i % 8) of byte (i // 8)
+    def generate_episode_columns(self, file_path, episodes):
+        columns = {name: [] for name in (
+            "crc32", "arc", "episode", "manga_chapters", "anime_episodes", "released", "duration",
+            "blake2s", "file_id", "file_name", "file_size", "file_hash", "file_index"
+        )}
+        bitsets = {"extended": [], "has_file": []}
+
+        for key, episode in self.episode_records(file_path, episodes):
+            hashes = episode.get("hashes", {})
+            file = episode.get("file", None)
+            bitsets["extended"].append(bool(episode.get("extended", False)))
+            bitsets["has_file"].append(isinstance(file, dict))
+            file = file if isinstance(file, dict) else {}
+
+            columns["crc32"].append(key)
+            columns["arc"].append(int(episode.get("arc", 0)))
+            columns["episode"].append(int(episode.get("episode", 0)))
+            columns["manga_chapters"].append(str(episode.get("manga_chapters", "")))
+            columns["anime_episodes"].append(str(episode.get("anime_episodes", "")))
+            columns["released"].append(self.epoch(episode.get("released", "")))
+            columns["duration"].append(int(episode.get("duration", 0)))
+            columns["blake2s"].append(str(hashes.get("blake2s", "")))
+            columns["file_id"].append(int(file.get("id", None) or 0))
+            columns["file_name"].append(str(file.get("name", "")))
+            columns["file_size"].append(str(file.get("size", "")))
+            columns["file_hash"].append(str(file.get("hash", "")))
+            columns["file_index"].append(int(file.get("index", None) or 0))
+
+        for name, bits in bitsets.items():
+            packed = bytearray((len(bits) + 7) // 8)
+            for i, bit in enumerate(bits):
+                if bit:
+                    packed[i >> 3] |= 1 << (i & 7)
+
+            columns[name] = base64.b64encode(bytes(packed)).decode("ascii")
+
+        self.write_atomic(file_path, json.dumps({
+            "version": 1,
+            "count": len(columns["crc32"]),
+            "bitsets": list(bitsets.keys()),
+            "columns": columns
+        }, separators=(',', ':')))
+
+    def load_manifest(self):
+        manifest_file = Path(self.cache_dir, "manifest.json")
+
+        try:
+            manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+            if manifest.get("version", 0) == 1:
+                return manifest
+        except FileNotFoundError:
+            pass
+        except:
+            logger.exception(f"Ignoring unreadable manifest: {manifest_file}")
+
+        return {}
+
+    def save_manifest(self, manifest):
+        if not self.cache_dir.is_dir():
+            self.cache_dir.mkdir(exist_ok=True, parents=True)
+
+        self.write_atomic(Path(self.cache_dir, "manifest.json"), json.dumps(manifest, indent=2))
+
+    def file_digest(self, file_path, cached=None):
+        st = file_path.stat()
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached
+
+        return [st.st_size, st.st_mtime_ns, hashlib.blake2b(file_path.read_bytes(), digest_size=16).hexdigest()]
+
+    def hash_inputs(self, cached_inputs):
+        inputs = {}
+        sections = {}
+
+        other_files = {
+            "config": [(None, Path("../config.yml"))],
+            "schema": [(None, Path("./schema.sql"))],
+            "posters": [(None, poster) for poster in sorted(self.arc_dir.rglob("poster.png"))]
+        }
+
+        for section in ("arcs", "descriptions", "episodes", "other_edits", "config", "schema", "posters"):
+            h = hashlib.blake2b(digest_size=16)
+            files = other_files[section] if section in other_files else self.corpus_files(section)
+
+            for key, file_path in files:
+                h.update(f"{key}\0".encode("utf-8"))
+                if file_path is None:
+                    continue
+
+                inputs[str(file_path)] = self.file_digest(file_path, cached_inputs.get(str(file_path)))
+                h.update(f"{file_path}\0{inputs[str(file_path)][2]}\n".encode("utf-8"))
+
+            sections[section] = h.hexdigest()
+
+        # The generator itself is an input: editing main.py or bumping the
+        # output schema rebuilds everything, a new METADATA_VERSION only the
+        # files that carry the status
+        h = hashlib.blake2b(digest_size=16)
+        h.update(Path(__file__).read_bytes())
+        h.update(f"\0{self.OUTPUT_SCHEMA_VERSION}".encode("utf-8"))
+        sections["generator"] = h.hexdigest()
+        sections["version"] = os.environ.get("METADATA_VERSION", "0")
+
+        return (inputs, sections)
+
+    def artifact_dirty(self, outputs, files, deps, sections):
+        for file_path in files:
+            recorded = outputs.get(str(file_path))
+            if recorded is None or not file_path.is_file():
+                return True
+
+            for dep in deps:
+                if recorded["sections"].get(dep, "") != sections[dep]:
+                    return True
+
+            if self.file_digest(file_path, recorded["file"]) != recorded["file"]:
+                return True
+
+        return False
+
+    # update_sqlite only changes rows, so a database built from another
+    # schema.sql (or one not in the manifest) is rebuilt instead
+    def schema_changed(self, outputs, file_path, sections):
+        recorded = outputs.get(str(file_path))
+        if recorded is not None and recorded["sections"].get("schema", "") == sections["schema"]:
+            return False
+
+        logger.info(f"-- {file_path}: not recorded as built from the current schema.sql, rebuilding")
+        return True
+
+    def record_artifact(self, outputs, files, deps, sections):
+        for file_path in files:
+            outputs[str(file_path)] = {
+                "file": self.file_digest(file_path),
+                "sections": {dep: sections[dep] for dep in deps}
+            }
+
+    # Fixed mtime and settings keep the output byte-for-byte reproducible
+    def compress_artifact(self, file_path):
+        content = file_path.read_bytes()
+
+        self.write_atomic(Path(f"{file_path}.gz"), gzip.compress(content, compresslevel=9, mtime=0))
+        self.write_atomic(Path(f"{file_path}.xz"), lzma.compress(content, format=lzma.FORMAT_XZ, check=lzma.CHECK_CRC64, preset=6))
+
+    def compress_artifacts(self, files, compressed):
+        new_compressed = {}
+        jobs = []
+
+        for file_path in files:
+            if not file_path.is_file():
+                continue
+
+            recorded = compressed.get(str(file_path), None)
+            digest = self.file_digest(file_path, recorded)
+            new_compressed[str(file_path)] = digest
+
+            if recorded is not None and recorded[2] == digest[2] and Path(f"{file_path}.gz").is_file() and Path(f"{file_path}.xz").is_file():
+                continue
+
+            jobs.append(file_path)
+
+        if len(jobs) == 0:
+            return new_compressed
+
+        logger.info(f"Compressing {len(jobs)} artifacts")
+
+        # zlib and lzma release the GIL while compressing
+        with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+            list(pool.map(self.compress_artifact, jobs))
+
+        return new_compressed
+
+    # Shards and deltas are listed by their own index files, so a deleted or
+    # edited shard or delta makes the data dirty too
+    def listed_files(self):
+        shards_manifest = Path(self.metadata_dir, "shards", "manifest.json")
+        deltas_index = Path(self.metadata_dir, "deltas", "index.json")
+        files = [shards_manifest, deltas_index]
+
+        try:
+            manifest = json.loads(shards_manifest.read_text(encoding="utf-8"))
+            files.extend(Path(self.metadata_dir, "shards", name) for name in sorted(manifest.get("shards", {}).keys()))
+        except FileNotFoundError:
+            pass
+        except:
+            logger.exception(f"Ignoring unreadable shard manifest: {shards_manifest}")
+
+        try:
+            index = json.loads(deltas_index.read_text(encoding="utf-8"))
+            files.extend(Path(self.metadata_dir, d["file"]) for d in index.get("deltas", []))
+        except FileNotFoundError:
+            pass
+        except:
+            logger.exception(f"Ignoring unreadable delta index: {deltas_index}")
+
+        return files
+
+    def write_artifact(self, name, encoded, data_yml):
+        self.write_atomic(Path(self.metadata_dir, f"{name}.json"), encoded[0])
+        self.write_atomic(Path(self.metadata_dir, f"{name}.min.json"), encoded[1])
+        self.write_yaml(Path(self.metadata_dir, f"{name}.yml"), data_yml, atomic=True)
+
+    def generate_data(self, full=False):
+        manifest = {} if full else self.load_manifest()
+        outputs = manifest.get("outputs", {})
+        inputs, sections = self.hash_inputs(manifest.get("inputs", {}))
+        new_outputs = {}
+
+        triplets = {
+            "arcs": ("arcs", "generator"),
+            "descriptions": ("descriptions", "generator"),
+            "episodes": ("episodes", "generator"),
+            "other_edits": ("other_edits", "generator"),
+            "tvshow": ("config", "generator")
+        }
+
+        triplet_files = {
+            name: [Path(self.metadata_dir, f"{name}.json"), Path(self.metadata_dir, f"{name}.min.json"), Path(self.metadata_dir, f"{name}.yml")]
+            for name in triplets.keys()
+        }
+        triplet_files["episodes"].append(Path(self.metadata_dir, "episodes.idx"))
+        triplet_files["episodes"].append(Path(self.metadata_dir, "episodes.columns.json"))
+
+        data_sqlite = Path(self.metadata_dir, "data.sqlite")
+        data_posters_sqlite = Path(self.metadata_dir, "data_with_posters.sqlite")
+
+        data_files = [
+            Path(self.metadata_dir, "status.json"),
+            Path(self.metadata_dir, "status.yml"),
+            Path(self.metadata_dir, "data.json"),
+            Path(self.metadata_dir, "data.min.json"),
+            Path(self.metadata_dir, "data.yml"),
+            Path(self.metadata_dir, "data.msgpack"),
+            data_sqlite,
+            data_posters_sqlite,
+            Path("../data.json"),
+            Path("../data.min.json")
+        ]
+
+        listed_files = self.listed_files()
+        rebuild_data = self.artifact_dirty(outputs, data_files + listed_files, sections.keys(), sections)
+        dirty = {name: self.artifact_dirty(outputs, triplet_files[name], deps, sections) for name, deps in triplets.items()}
+        artifact_files = [file_path for files in triplet_files.values() for file_path in files] + data_files
+
+        if not rebuild_data and not any(dirty.values()):
+            logger.success("No changes since the last build, skipping")
+            manifest["compressed"] = self.compress_artifacts(artifact_files, manifest.get("compressed", {}))
+            self.save_manifest(manifest)
+            return
+
+        for name, deps in triplets.items():
+            if not dirty[name]:
+                logger.info(f"Skipping {name}: unchanged")
+                for file_path in triplet_files[name]:
+                    new_outputs[str(file_path)] = outputs[str(file_path)]
+
+        corpus_sections = [name for name in ("arcs", "descriptions", "episodes", "other_edits") if dirty[name] or rebuild_data]
+        if len(corpus_sections) > 0:
+            logger.info(f"Loading {', '.join(corpus_sections)}")
+            self.load_corpus(*corpus_sections)
+
+        encoded = {}
+
+        if dirty["arcs"] or rebuild_data:
+            logger.info("Generate arcs")
+            arcs = self.generate_arcs()
+            encoded["arcs"] = self.encode_json(arcs)
+
+        if dirty["arcs"]:
+            self.write_artifact("arcs", encoded["arcs"], arcs)
+            self.record_artifact(new_outputs, triplet_files["arcs"], triplets["arcs"], sections)
+
+        if dirty["descriptions"] or rebuild_data:
+            logger.info("Generate descriptions")
+            descriptions = self.generate_descriptions()
+            encoded["descriptions"] = self.encode_json(descriptions)
+
+        if dirty["descriptions"]:
+            self.write_artifact("descriptions", encoded["descriptions"], descriptions)
+            self.record_artifact(new_outputs, triplet_files["descriptions"], triplets["descriptions"], sections)
+
+        if dirty["episodes"] or rebuild_data:
+            logger.info("Generate episodes")
+            episodes_yml = self.generate_episodes(for_json=False)
+            encoded["episodes"] = self.encode_json(episodes_yml)
+
+        if dirty["episodes"]:
+            self.write_artifact("episodes", encoded["episodes"], episodes_yml)
+            self.generate_episode_index(Path(self.metadata_dir, "episodes.idx"), episodes_yml)
+            self.generate_episode_columns(Path(self.metadata_dir, "episodes.columns.json"), episodes_yml)
+            self.record_artifact(new_outputs, triplet_files["episodes"], triplets["episodes"], sections)
 
         #logger.info("Generate stremio")
         #self.generate_stremio(Path("..", "stremio"), arcs, episodes, descriptions)
 
-        logger.info("Generate other edits")
-        other_edits = self.generate_other_edits(for_json=True)
-        other_edits_yml = self.generate_other_edits(for_json=False)
-        Path(self.metadata_dir, "other_edits.json").write_text(json.dumps(other_edits, indent=2, default=self.serialize_json))
-        Path(self.metadata_dir, "other_edits.min.json").write_text(json.dumps(other_edits, separators=(',', ':'), default=self.serialize_json))
-        self.write_yaml(Path(self.metadata_dir, "other_edits.yml"), other_edits_yml)
+        if dirty["other_edits"] or rebuild_data:
+            logger.info("Generate other edits")
+            other_edits_yml = self.generate_other_edits(for_json=False)
+            encoded["other_edits"] = self.encode_json(other_edits_yml)
+
+        if dirty["other_edits"]:
+            self.write_artifact("other_edits", encoded["other_edits"], other_edits_yml)
+            self.record_artifact(new_outputs, triplet_files["other_edits"], triplets["other_edits"], sections)
+
+        if dirty["tvshow"] or rebuild_data:
+            logger.info("Generate tvshow")
+            tvshow = self.generate_tvshow()
+            encoded["tvshow"] = self.encode_json(tvshow)
 
-        logger.info("Generate tvshow")
-        tvshow = self.generate_tvshow()
-        Path(self.metadata_dir, "tvshow.json").write_text(json.dumps(tvshow, indent=2, default=self.serialize_json))
-        Path(self.metadata_dir, "tvshow.min.json").write_text(json.dumps(tvshow, separators=(',', ':'), default=self.serialize_json))
-        self.write_yaml(Path(self.metadata_dir, "tvshow.yml"), tvshow)
+        if dirty["tvshow"]:
+            self.write_artifact("tvshow", encoded["tvshow"], tvshow)
+            self.record_artifact(new_outputs, triplet_files["tvshow"], triplets["tvshow"], sections)
+
+        if not rebuild_data:
+            for file_path in data_files + listed_files:
+                new_outputs[str(file_path)] = outputs[str(file_path)]
+
+            compressed = self.compress_artifacts(artifact_files, manifest.get("compressed", {}))
+            self.save_manifest({"version": 1, "inputs": inputs, "outputs": new_outputs, "compressed": compressed})
+            return
 
         now = datetime.now(tz=timezone.utc).replace(microsecond=0)
 
@@ -1858,44 +2995,240 @@ class OnePaceMetadata:
             "version": int(os.environ['METADATA_VERSION']) if 'METADATA_VERSION' in os.environ else 0
         }
 
-        Path(self.metadata_dir, "status.json").write_text(json.dumps(status, indent=2, default=self.serialize_json))
-        self.write_yaml(Path(self.metadata_dir, "status.yml"), status)
+        encoded["status"] = self.encode_json(status)
+        self.write_atomic(Path(self.metadata_dir, "status.json"), encoded["status"][0])
+        self.write_yaml(Path(self.metadata_dir, "status.yml"), status, atomic=True)
+
+        logger.info("Generate data.json")
+        data_json = self.join_json({key: encoded[key] for key in ("status", "tvshow", "arcs", "descriptions", "episodes", "other_edits")})
+        previous = self.load_previous_data(Path(self.metadata_dir, "data.min.json"))
+        self.write_atomic(Path(self.metadata_dir, "data.json"), data_json[0])
+        self.write_atomic(Path(self.metadata_dir, "data.min.json"), data_json[1])
+
+        logger.info("Generate deltas")
+        self.write_delta(previous, json.loads(data_json[1]), len(data_json[1].encode("utf-8")))
+
+        logger.info("Generate shards")
+        self.write_shards(arcs, descriptions, episodes_yml, status)
 
         data = {
             "status": status,
             "tvshow": tvshow,
             "arcs": arcs,
             "descriptions": descriptions,
-            "episodes": episodes,
-            "other_edits": other_edits
+            "episodes": episodes_yml,
+            "other_edits": other_edits_yml
         }
 
-        logger.info("Generate data.json")
-        Path(self.metadata_dir, "data.json").write_text(json.dumps(data, indent=2, default=self.serialize_json))
-        Path(self.metadata_dir, "data.min.json").write_text(json.dumps(data, separators=(',', ':'), default=self.serialize_json))
-
-        data["episodes"] = self.generate_episodes(for_json=False)
-        data["other_edits"] = other_edits_yml
-        self.write_yaml(Path(self.metadata_dir, "data.yml"), data)
+        self.write_yaml(Path(self.metadata_dir, "data.yml"), data, atomic=True)
 
-        data_sqlite = Path(self.metadata_dir, "data.sqlite")
-        if data_sqlite.is_file():
-            data_sqlite.unlink()
+        logger.info("Generate data.msgpack")
+        self.write_atomic(Path(self.metadata_dir, "data.msgpack"), PackedData.encode(self.normalize_json(data)))
 
-        data_posters_sqlite = Path(self.metadata_dir, "data_with_posters.sqlite")
-        if data_posters_sqlite.is_file():
-            data_posters_sqlite.unlink()
-
-        data["episodes"] = self.generate_episodes(for_json=False, exclude_archived=False)
+        rows = self.sqlite_rows(arcs, self.generate_episodes(for_json=False, exclude_archived=False), descriptions, status, tvshow, other_edits_yml)
+        posters = self.sqlite_posters(arcs)
 
         logger.info("Generate data.sqlite")
-        self.generate_sqlite(data_sqlite, data["arcs"], data["episodes"], data["descriptions"], status, tvshow, data["other_edits"], False)
+        rebuild_sqlite = full or not data_sqlite.is_file() or self.schema_changed(outputs, data_sqlite, sections)
+        if not rebuild_sqlite:
+            try:
+                self.update_sqlite(data_sqlite, rows)
+            except:
+                logger.exception(f"Unable to update {data_sqlite}, rebuilding")
+                rebuild_sqlite = True
+
+        if rebuild_sqlite:
+            self.generate_sqlite(data_sqlite, rows)
 
         logger.info("Generate data_with_posters.sqlite")
-        self.generate_sqlite(data_posters_sqlite, data["arcs"], data["episodes"], data["descriptions"], status, tvshow, data["other_edits"], True)
+        rebuild_sqlite = full or not data_posters_sqlite.is_file() or self.schema_changed(outputs, data_posters_sqlite, sections)
+        if not rebuild_sqlite:
+            try:
+                self.update_sqlite(data_posters_sqlite, self.sqlite_rows_with_posters(rows, posters))
+            except:
+                logger.exception(f"Unable to update {data_posters_sqlite}, rebuilding")
+                rebuild_sqlite = True
+
+        if rebuild_sqlite:
+            self.generate_sqlite_posters(data_sqlite, data_posters_sqlite, posters)
 
         logger.info("Generate data.json compatible with Organizer")
-        self.generate_compat_data(arcs, episodes, descriptions, status, tvshow)
+        self.generate_compat_data(arcs, episodes_yml, descriptions, status, tvshow)
+
+        self.record_artifact(new_outputs, data_files + self.listed_files(), sections.keys(), sections)
+        compressed = self.compress_artifacts(artifact_files, manifest.get("compressed", {}))
+        self.save_manifest({"version": 1, "inputs": inputs, "outputs": new_outputs, "compressed": compressed})
+
+    def load_previous_data(self, file_path):
+        try:
+            return json.loads(file_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+        except:
+            logger.exception(f"Unable to read the previous snapshot: {file_path}")
+
+        return None
+
+    def delta_entries(self, data):
+        entries = {"tvshow": {}, "arcs": {}, "descriptions": {}, "episodes": {}, "other_edits": {}}
+
+        for lang, tvshow in data.get("tvshow", {}).items():
+            entries["tvshow"][lang] = tvshow
+
+        for lang, arcs in data.get("arcs", {}).items():
+            for arc in arcs:
+                entries["arcs"][f"{lang}/{arc.get('part', 0)}"] = arc
+
+        for lang, descriptions in data.get("descriptions", {}).items():
+            for desc in descriptions:
+                entries["descriptions"][f"{lang}/{desc.get('arc', 0)}/{desc.get('episode', '')}"] = desc
+
+        for crc32, episode in data.get("episodes", {}).items():
+            entries["episodes"][crc32] = episode
+
+        for name, edit in data.get("other_edits", {}).items():
+            for key, episode in edit.items():
+                entries["other_edits"][f"{name}/{key}"] = episode
+
+        return entries
+
+    def generate_delta(self, previous, current):
+        old_entries = self.delta_entries(previous)
+        new_entries = self.delta_entries(current)
+        delta = {}
+
+        for section, new in new_entries.items():
+            old = old_entries[section]
+
+            added = {key: value for key, value in new.items() if key not in old}
+            changed = {key: value for key, value in new.items() if key in old and old[key] != value}
+            removed = [key for key in old.keys() if key not in new]
+
+            if len(added) > 0 or len(changed) > 0 or len(removed) > 0:
+                delta[section] = {"added": added, "changed": changed, "removed": removed}
+
+        return delta
+
+    # Each delta turns the data.min.json of one last_update_ts into the next
+    # one, and deltas/index.json lists them in order so clients can replay
+    # the chain starting from the timestamp they already have
+    def write_delta(self, previous, current, data_size):
+        deltas_dir = Path(self.metadata_dir, "deltas")
+        if not deltas_dir.is_dir():
+            deltas_dir.mkdir(exist_ok=True, parents=True)
+
+        index_file = Path(deltas_dir, "index.json")
+        to_ts = current["status"]["last_update_ts"]
+
+        # Without a previous version there is nothing to diff against, but the
+        # index still has to exist for the build manifest to track it
+        if previous is None or previous.get("status", {}).get("last_update_ts", to_ts) == to_ts:
+            if not index_file.is_file():
+                self.write_atomic(index_file, json.dumps({"version": 1, "latest": to_ts, "data_size": data_size, "deltas": []}, indent=2))
+            return
+
+        from_ts = previous["status"]["last_update_ts"]
+        index = {"version": 1, "latest": None, "deltas": []}
+
+        try:
+            loaded = json.loads(index_file.read_text(encoding="utf-8"))
+            if loaded.get("version", 0) == 1:
+                index = loaded
+        except FileNotFoundError:
+            pass
+        except:
+            logger.exception(f"Ignoring unreadable delta index: {index_file}")
+
+        delta = self.generate_delta(previous, current)
+        content = json.dumps({
+            "from": from_ts,
+            "to": to_ts,
+            "version": current["status"].get("version", 0),
+            "sections": delta
+        }, separators=(',', ':'))
+
+        self.write_atomic(Path(deltas_dir, f"{to_ts}.json"), content)
+
+        # A snapshot written without a delta breaks the chain, and older
+        # deltas can no longer reach the latest version
+        deltas = index["deltas"] if index["latest"] == from_ts else []
+        deltas.append({"from": from_ts, "to": to_ts, "file": f"deltas/{to_ts}.json", "size": len(content.encode("utf-8"))})
+
+        history = int(self.config.get("delta_history", 100))
+        keep = deltas[-history:] if history > 0 else []
+        kept_files = set(d["file"] for d in keep)
+
+        for d in index["deltas"] + deltas:
+            if d["file"] not in kept_files:
+                Path(self.metadata_dir, d["file"]).unlink(missing_ok=True)
+
+        self.write_atomic(index_file, json.dumps({"version": 1, "latest": to_ts, "data_size": data_size, "deltas": keep}, indent=2))
+
+        logger.info(f"Wrote delta {from_ts} -> {to_ts}: " + ", ".join(f"{section} +{len(d['added'])} ~{len(d['changed'])} -{len(d['removed'])}" for section, d in delta.items()))
+
+    def generate_shards(self, arcs, descriptions, episodes):
+        shards = {}
+
+        for lang, items in arcs.items():
+            shards[f"arcs/{lang}.json"] = items
+
+        for lang, items in descriptions.items():
+            shards[f"descriptions/{lang}.json"] = items
+
+        # Duplicate CRC32s are stored as a list, and each entry can belong to a different arc
+        for crc32, value in episodes.items():
+            for episode in ([value] if isinstance(value, dict) else value):
+                arc_shard = shards.setdefault(f"episodes/arc/{episode.get('arc', 0)}.json", {})
+                if crc32 not in arc_shard:
+                    arc_shard[crc32] = episode
+                elif isinstance(arc_shard[crc32], dict):
+                    arc_shard[crc32] = [arc_shard[crc32], episode]
+                else:
+                    arc_shard[crc32].append(episode)
+
+            shards.setdefault(f"episodes/crc/{crc32[:2].upper()}.json", {})[crc32] = value
+
+        return shards
+
+    # Small files for clients that only need one language, arc or CRC32;
+    # manifest.json lists every shard with its size and hash
+    def write_shards(self, arcs, descriptions, episodes, status):
+        shards_dir = Path(self.metadata_dir, "shards")
+        manifest = {}
+        written = 0
+
+        for name, data in sorted(self.generate_shards(arcs, descriptions, episodes).items()):
+            content = json.dumps(self.normalize_json(data), separators=(',', ':')).encode("utf-8")
+            shard_file = Path(shards_dir, name)
+
+            manifest[name] = {
+                "size": len(content),
+                "blake2b": hashlib.blake2b(content, digest_size=16).hexdigest()
+            }
+
+            try:
+                if shard_file.read_bytes() == content:
+                    continue
+            except FileNotFoundError:
+                shard_file.parent.mkdir(exist_ok=True, parents=True)
+
+            self.write_atomic(shard_file, content)
+            written += 1
+
+        removed = 0
+        for shard_file in shards_dir.rglob("*.json"):
+            name = shard_file.relative_to(shards_dir).as_posix()
+            if name != "manifest.json" and name not in manifest:
+                shard_file.unlink()
+                removed += 1
+
+        self.write_atomic(Path(shards_dir, "manifest.json"), json.dumps({
+            "version": 1,
+            "last_update_ts": status["last_update_ts"],
+            "shards": manifest
+        }, indent=2))
+
+        logger.info(f"Wrote {written} of {len(manifest)} shards, removed {removed}")
 
     def generate_compat_data(self, arcs, episodes, descriptions, status, tvshow):
         try:
@@ -1948,25 +3281,52 @@ class OnePaceMetadata:
                             }
                         }
 
-            data = Path("../data.json")
-            data.unlink(missing_ok=True)
-            data.write_text(json.dumps(output, indent=2, default=self.serialize_json))
-
-            data = Path("../data.min.json")
-            data.unlink(missing_ok=True)
-            data.write_text(json.dumps(output, separators=(',', ':'), default=self.serialize_json))
+            data_json = self.encode_json(output)
+            self.write_atomic(Path("../data.json"), data_json[0])
+            self.write_atomic(Path("../data.min.json"), data_json[1])
 
         except:
             logger.exception("Unable to create compat data.json")
 
     def cmd_update(self, forced=False):
-        self.client = httpx.Client(
-            transport=httpx_retries.RetryTransport(
-                retry=httpx_retries.Retry(total=999, backoff_factor=5.0)
-            )
+        asyncio.run(self.run_update(forced))
+
+    async def run_source(self, name, coro):
+        start = time.perf_counter()
+        remaining = self.deadline - time.monotonic()
+        status = "ok"
+
+        if remaining <= 0:
+            coro.close()
+            status = "skipped, deadline reached"
+        else:
+            try:
+                if await asyncio.wait_for(coro, timeout=remaining) is False:
+                    status = "failed"
+            except asyncio.TimeoutError:
+                status = "stopped, deadline reached"
+            except SourceUnavailable as e:
+                status = f"skipped, {e}"
+            except:
+                logger.exception(f"Unable to update from {name}")
+                status = "failed"
+
+        if status != "ok":
+            logger.error(f"{name}: {status}")
+
+        self.source_timings.append((name, time.perf_counter() - start, status))
+
+    async def run_update(self, forced=False):
+        concurrency = int(self.config.get("http_concurrency", 8))
+        self.http_limit = asyncio.Semaphore(concurrency)
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency))
         )
 
         now = datetime.now(tz=timezone.utc)
+        self.load_http_cache()
+        self.load_retry_policy()
+        self.source_timings = []
 
         try:
             is_workflow_dispatch = forced or os.environ.get("GITHUB_EVENT_NAME", "") == "workflow_dispatch"
@@ -1975,27 +3335,1092 @@ class OnePaceMetadata:
             self.load_arcs()
 
             logger.success("Loading title.properties / chapter.properties")
-            self.get_titles_chapters()
+            await self.run_source("title.properties / chapter.properties", self.get_titles_chapters())
 
             if now.hour % int(self.config["check_ep_descriptions_every_hours"]) == 0 or is_workflow_dispatch:
                 logger.success("Updating episode descriptions")
-                self.update_desc_sources()
+                await self.run_source("episode descriptions", self.update_desc_sources())
 
             if (now.hour % int(self.config["check_rss_every_hours"]) == 0 and self.ONE_PACE_RSS_FEED != "") or is_workflow_dispatch:
                 logger.success("Checking RSS feed for new releases")
-                self.update_from_rss_feed(self.ONE_PACE_RSS_FEED)
+                await self.run_source("RSS feed", self.update_from_rss_feed(self.ONE_PACE_RSS_FEED))
 
             if now.hour % int(self.config["check_ep_guide_every_hours"]) == 0 or is_workflow_dispatch:
                 logger.success("Updating metadata from episode guide")
-                self.update_from_episode_guide()
+                await self.run_source("episode guide", self.update_from_episode_guide())
 
         finally:
-            self.client.close()
+            await self.client.aclose()
+            self.save_http_cache()
+            self.flush_docs()
+
+            for name, elapsed, status in self.source_timings:
+                logger.info(f"-- {name}: {elapsed:.1f}s, {status}")
+
+            if self.retry_budget <= 0:
+                logger.warning("The retry budget for this run was used up")
 
-    def cmd_json(self):
+    def cmd_json(self, full=False):
         sqlite3.register_adapter(date, self.serialize_json)
         sqlite3.register_adapter(datetime, self.serialize_json)
-        self.generate_data()
+        self.generate_data(full)
+
+    def media_files(self, library_dir):
+        for file_path in sorted(library_dir.rglob("*")):
+            if not file_path.is_file() or file_path.name.startswith("."):
+                continue
+
+            if file_path.suffix.lower() in self.MEDIA_EXTENSIONS:
+                yield file_path
+
+    def load_rss_state(self):
+        state_file = Path(self.cache_dir, "rss.json")
+
+        try:
+            state = json.loads(state_file.read_text(encoding="utf-8"))
+            if state.get("version", 0) == 1:
+                return state
+        except FileNotFoundError:
+            pass
+        except:
+            logger.exception(f"Ignoring unreadable RSS state: {state_file}")
+
+        return {"version": 1, "last_pub_date": "", "seen": {}}
+
+    def save_rss_state(self, state):
+        if not self.cache_dir.is_dir():
+            self.cache_dir.mkdir(exist_ok=True, parents=True)
+
+        self.write_atomic(Path(self.cache_dir, "rss.json"), json.dumps(state, indent=2))
+
+    def load_backfill_state(self):
+        state_file = Path(self.cache_dir, "backfill.json")
+
+        try:
+            state = json.loads(state_file.read_text(encoding="utf-8"))
+            # Version 1 cached blake2s truncated to 16 hex digits
+            if state.get("version", 0) == 2:
+                return state
+        except FileNotFoundError:
+            pass
+        except:
+            logger.exception(f"Ignoring unreadable backfill state: {state_file}")
+
+        return {"version": 2, "files": {}}
+
+    def save_backfill_state(self, state):
+        if not self.cache_dir.is_dir():
+            self.cache_dir.mkdir(exist_ok=True, parents=True)
+
+        self.write_atomic(Path(self.cache_dir, "backfill.json"), json.dumps(state, indent=2))
+
+    def write_blake2s(self, yml, blake2s):
+        text = yml.read_text(encoding="utf-8")
+        text, n = re.subn(r"^(\s+blake2s:)[ \t]*(?:''|\"\")?[ \t]*$", rf"\g<1> {blake2s}", text, count=1, flags=re.MULTILINE)
+
+        if n == 1:
+            self.write_atomic(yml, text)
+        else:
+            data = self.read_yaml(yml)
+            data.setdefault("hashes", {})["blake2s"] = blake2s
+            self.write_yaml(yml, data, atomic=True)
+
+    def cmd_backfill(self, library_dir, workers=4):
+        library_dir = Path(library_dir)
+        if not library_dir.is_dir():
+            logger.critical(f"{library_dir} is not a directory")
+            sys.exit(1)
+
+        self.load_corpus("episodes")
+
+        targets = {}
+        known = {}
+        for archived, yml, data in self.corpus["episodes"]:
+            hashes = data.get("hashes", {})
+            crc32 = str(hashes.get("crc32", "")).upper()
+            blake2s = str(hashes.get("blake2s", "") or "").lower()
+
+            if crc32 == "":
+                continue
+
+            if blake2s == "":
+                targets.setdefault(crc32, []).append(yml)
+            elif re.fullmatch(r"[0-9a-f]{64}", blake2s) is None:
+                logger.warning(f"{yml}: blake2s {blake2s} is not a full BLAKE2s-256 hex digest")
+            else:
+                known[crc32] = (yml, blake2s)
+
+        state = self.load_backfill_state()
+        results = {}
+        pending = []
+
+        # Files hashed by an earlier, interrupted run are not read again
+        for file_path in self.media_files(library_dir):
+            st = file_path.stat()
+            cached = state["files"].get(str(file_path.resolve()))
+
+            if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                results[file_path] = (cached[2], cached[3])
+            else:
+                pending.append(file_path)
+
+        logger.info(f"{sum(len(v) for v in targets.values())} episodes without blake2s, hashing {len(pending)} files ({len(results)} from a previous run) with {workers} workers")
+
+        hash_both = partial(hash_file_safe, with_blake2s=True)
+        total_size = 0
+        start = time.perf_counter()
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for i, (file_path, (crc32, blake2s, size, error)) in enumerate(zip(pending, pool.map(hash_both, pending))):
+                    total_size += size
+
+                    if error is not None:
+                        logger.error(f"{file_path.relative_to(library_dir)}: {error}")
+                        continue
+
+                    st = file_path.stat()
+                    results[file_path] = (f"{crc32:08X}", blake2s)
+                    state["files"][str(file_path.resolve())] = [st.st_size, st.st_mtime_ns, f"{crc32:08X}", blake2s]
+
+                    if i % 16 == 15:
+                        self.save_backfill_state(state)
+        finally:
+            self.save_backfill_state(state)
+
+        elapsed = time.perf_counter() - start
+        updated = 0
+        verified = 0
+
+        for file_path, (crc32, blake2s) in sorted(results.items()):
+            name = file_path.relative_to(library_dir)
+
+            # Files that already have a blake2s check this digest matches the stored format
+            if crc32 in known:
+                yml, expected = known[crc32]
+                if expected == blake2s:
+                    verified += 1
+                else:
+                    logger.warning(f"{name}: blake2s {blake2s} does not match {expected} in {yml}")
+
+            match = re.search(r"\[([0-9A-F]{8})\]", file_path.name, re.IGNORECASE)
+            if match is not None and match.group(1).upper() != crc32:
+                logger.warning(f"{name}: file name says {match.group(1).upper()} but the contents hash to {crc32}, skipping")
+                continue
+
+            for yml in targets.pop(crc32, []):
+                try:
+                    self.write_blake2s(yml, blake2s)
+                    logger.info(f"-- {yml}: blake2s = {blake2s} ({name})")
+                    updated += 1
+                except:
+                    logger.exception(f"Unable to update {yml}")
+
+        logger.success(
+            f"Updated {updated} episodes, {verified} existing blake2s verified, {sum(len(v) for v in targets.values())} still without blake2s "
+            f"({total_size / 1048576:.0f} MiB hashed in {elapsed:.1f}s, {total_size / 1048576 / max(elapsed, 0.001):.0f} MiB/s)"
+        )
+
+        return updated
+
+    def cmd_identify(self, library_dir, workers=4):
+        library_dir = Path(library_dir)
+        if not library_dir.is_dir():
+            logger.critical(f"{library_dir} is not a directory")
+            sys.exit(1)
+
+        source = Path(self.metadata_dir, "data.sqlite")
+        if not source.is_file():
+            source = Path(self.metadata_dir, "data.json")
+
+        files = list(self.media_files(library_dir))
+        logger.info(f"Hashing {len(files)} files in {library_dir} with {workers} workers")
+
+        identified = []
+        unknown = []
+        failed = []
+        total_size = 0
+        start = time.perf_counter()
+
+        with OnePaceIndex(source, archived=True) as index, ThreadPoolExecutor(max_workers=workers) as pool:
+            for file_path, (crc32, _, size, error) in zip(files, pool.map(hash_file_safe, files)):
+                name = file_path.relative_to(library_dir)
+                total_size += size
+
+                if error is not None:
+                    logger.error(f"{name}: {error}")
+                    failed.append(file_path)
+                    continue
+
+                crc32 = f"{crc32:08X}"
+                result = index.by_crc32(crc32)
+
+                if result is None:
+                    print(f"{crc32}  {name}  unknown")
+                    unknown.append(file_path)
+                    continue
+
+                ep = result["episode"]
+                arc_title = result["arc"]["title"] if result["arc"] is not None else f"Arc {ep['arc']}"
+                title = result["description"]["title"] if result["description"] is not None else ""
+                episode = str(ep.get("episode", "") or "")
+                label = f"{arc_title} {int(episode):02d}" if episode.isdigit() else f"{arc_title} {episode}".rstrip()
+
+                if result["type"] == "other_edit":
+                    label = f"{result['edit_name']}: {label}"
+                if ep["extended"]:
+                    label = f"{label} (Extended)"
+                if ep.get("archived", False):
+                    label = f"{label} (archived)"
+
+                print(f"{crc32}  {name}  {label}{' - ' + title if title != '' else ''}")
+                identified.append(file_path)
+
+                # The release names carry the CRC32, a mismatch means the file is damaged
+                match = re.search(r"\[([0-9A-F]{8})\]", file_path.name, re.IGNORECASE)
+                if match is not None and match.group(1).upper() != crc32:
+                    logger.warning(f"{name}: file name says {match.group(1).upper()} but the contents hash to {crc32}")
+
+        elapsed = time.perf_counter() - start
+        logger.success(
+            f"Identified {len(identified)} of {len(files)} files, {len(unknown)} unknown, {len(failed)} unreadable "
+            f"({total_size / 1048576:.0f} MiB in {elapsed:.1f}s, {total_size / 1048576 / max(elapsed, 0.001):.0f} MiB/s)"
+        )
+
+        return (identified, unknown, failed)
+
+# Streams a Sheets htmlview page into the same row dicts the BeautifulSoup
+# scraper produced, keeping only the cells of the row being read
+class GSheetParser(HTMLParser):
+    def __init__(self, unicode_fix):
+        super().__init__(convert_charrefs=True)
+
+        self.unicode_fix = unicode_fix
+        self.data = []
+        self.poster = ""
+        self.headers = []
+
+        self.seen_img = False
+        self.seen_table = False
+        self.table_depth = 0
+        self.seen_tbody = False
+        self.tbody_depth = 0
+
+        self.row = None
+        self.header_depth = 0
+        self.cell_depth = 0
+        self.text = []
+
+    def flush_text(self):
+        if len(self.text) == 0:
+            return
+
+        text = "".join(self.text).strip()
+        self.text = []
+
+        if text == "" or self.row is None:
+            return
+
+        if self.header_depth > 0:
+            self.row["header"].append(text)
+        if self.cell_depth > 0:
+            self.row["cells"][-1][0].append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self.flush_text()
+
+        if tag == "img":
+            if not self.seen_img:
+                self.seen_img = True
+                self.poster = dict(attrs).get("src") or ""
+            return
+
+        if tag == "table":
+            if self.table_depth > 0:
+                self.table_depth += 1
+            elif not self.seen_table and "waffle" in (dict(attrs).get("class") or "").split():
+                self.seen_table = True
+                self.table_depth = 1
+            return
+
+        if self.table_depth == 0:
+            return
+
+        if tag == "tbody":
+            if self.tbody_depth > 0:
+                self.tbody_depth += 1
+            elif not self.seen_tbody:
+                self.seen_tbody = True
+                self.tbody_depth = 1
+            return
+
+        if self.tbody_depth == 0:
+            return
+
+        if tag == "tr":
+            self.end_row()
+            self.row = {"header": None, "cells": []}
+        elif self.row is None:
+            return
+        elif tag == "div":
+            if self.header_depth > 0:
+                self.header_depth += 1
+            elif self.row["header"] is None and "row-header-wrapper" in (dict(attrs).get("class") or "").split():
+                self.row["header"] = []
+                self.header_depth = 1
+        elif tag == "td":
+            if self.cell_depth > 0:
+                self.cell_depth += 1
+                return
+
+            classes = (dict(attrs).get("class") or "").split()
+            if len(classes) > 0 and classes[0].startswith("s"):
+                self.row["cells"].append(([], None))
+                self.cell_depth = 1
+        elif tag == "a" and self.cell_depth > 0:
+            texts, href = self.row["cells"][-1]
+            if href is None:
+                self.row["cells"][-1] = (texts, str(dict(attrs).get("href")))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in ("img", "br", "hr", "input", "meta", "link"):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self.flush_text()
+
+        if tag == "table" and self.table_depth > 0:
+            self.table_depth -= 1
+            if self.table_depth == 0:
+                self.end_row()
+                self.tbody_depth = 0
+        elif tag == "tbody" and self.tbody_depth > 0:
+            self.tbody_depth -= 1
+            if self.tbody_depth == 0:
+                self.end_row()
+        elif tag == "tr" and self.row is not None:
+            self.end_row()
+        elif tag == "div" and self.header_depth > 0:
+            self.header_depth -= 1
+        elif tag == "td" and self.cell_depth > 0:
+            self.cell_depth -= 1
+
+    def handle_data(self, data):
+        self.text.append(data)
+
+    def handle_comment(self, data):
+        self.flush_text()
+
+    def close(self):
+        super().close()
+        self.flush_text()
+        self.end_row()
+
+    def end_row(self):
+        row = self.row
+        self.row = None
+        self.header_depth = 0
+        self.cell_depth = 0
+
+        if row is None or row["header"] is None:
+            return
+
+        if "".join(row["header"]) == "1":
+            self.headers.extend("".join(texts) for texts, href in row["cells"])
+            return
+
+        inserted_data = {}
+        has_contents = False
+
+        for row_index, (texts, href) in enumerate(row["cells"]):
+            text = self.unicode_fix("".join(texts))
+
+            if href is not None:
+                if href.startswith("https://www.google.com/"):
+                    href = unquote(parse_qs(urlparse(href).query)['q'][0])
+
+                    inserted_data[self.headers[row_index]] = [text, href]
+            else:
+                inserted_data[self.headers[row_index]] = text
+
+            if not has_contents and text != "":
+                has_contents = True
+
+        if has_contents:
+            self.data.append(inserted_data)
+
+class EpisodeIndex:
+    MAGIC = b"OPEIDX01"
+    HEADER = "<8sII"
+    RECORD = "<HHBIIH"
+
+    record_struct = struct.Struct(RECORD)
+    length_struct = struct.Struct("<H")
+
+    def __init__(self, file_path):
+        self.file = open(file_path, mode="rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = None
+
+        magic, self.count, self.records_offset = struct.unpack_from(self.HEADER, self.mm, 0)
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f"{file_path} is not an episode index")
+
+        keys_offset = struct.calcsize(self.HEADER)
+        offsets_offset = keys_offset + self.count * 4
+
+        if sys.byteorder == "little":
+            self.view = memoryview(self.mm)
+            self.keys = self.view[keys_offset:offsets_offset].cast("I")
+            self.offsets = self.view[offsets_offset:self.records_offset].cast("I")
+        else:
+            self.keys = struct.unpack_from(f"<{self.count}I", self.mm, keys_offset)
+            self.offsets = struct.unpack_from(f"<{self.count}I", self.mm, offsets_offset)
+
+    def close(self):
+        if self.view is not None:
+            self.keys.release()
+            self.offsets.release()
+            self.view.release()
+            self.view = None
+
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, crc32):
+        return self.find(crc32) is not None
+
+    def find(self, crc32):
+        key = int(crc32, 16) if isinstance(crc32, str) else int(crc32)
+        i = bisect.bisect_left(self.keys, key)
+
+        if i < self.count and self.keys[i] == key:
+            return i
+
+        return None
+
+    # Duplicate CRC32s have one record each, next to each other in key order;
+    # find and get return the first, find_all and get_all every one of them
+    def find_all(self, crc32):
+        key = int(crc32, 16) if isinstance(crc32, str) else int(crc32)
+        return range(bisect.bisect_left(self.keys, key), bisect.bisect_right(self.keys, key))
+
+    def get(self, crc32, default=None):
+        i = self.find(crc32)
+        if i is None:
+            return default
+
+        return self.record(i)
+
+    def get_all(self, crc32):
+        return [self.record(i) for i in self.find_all(crc32)]
+
+    def record(self, i):
+        mm = self.mm
+        offset = self.records_offset + self.offsets[i]
+        arc, episode, flags, duration, file_id, file_index = self.record_struct.unpack_from(mm, offset)
+        offset += self.record_struct.size
+
+        values = []
+        for _ in range(7):
+            length = self.length_struct.unpack_from(mm, offset)[0]
+            offset += 2
+            values.append(str(mm[offset:offset + length], "utf-8"))
+            offset += length
+
+        released, manga_chapters, anime_episodes, blake2s, file_name, file_size, file_hash = values
+
+        result = {
+            "arc": arc,
+            "episode": episode,
+            "manga_chapters": manga_chapters,
+            "anime_episodes": anime_episodes,
+            "released": released,
+            "duration": duration,
+            "extended": flags & 1 == 1,
+            "hashes": {
+                "crc32": f"{self.keys[i]:08X}",
+                "blake2s": blake2s
+            }
+        }
+
+        if flags & 2 == 2:
+            result["file"] = {
+                "id": file_id,
+                "name": file_name,
+                "size": file_size,
+                "hash": file_hash,
+                "index": file_index
+            }
+
+        return result
+
+# MessagePack with an extra string table: strings that occur more than once
+# are stored once and referenced through ext type 1 (a big-endian index).
+# The file is [MAGIC, strings, data], so any MessagePack reader can parse it.
+class PackedData:
+    MAGIC = "OPDATA01"
+    STRING_REF = 1
+
+    @classmethod
+    def count_strings(cls, obj, counts):
+        if isinstance(obj, str):
+            counts[obj] = counts.get(obj, 0) + 1
+        elif isinstance(obj, dict):
+            for k, v in obj.items():
+                cls.count_strings(k, counts)
+                cls.count_strings(v, counts)
+        elif isinstance(obj, (list, tuple)):
+            for v in obj:
+                cls.count_strings(v, counts)
+
+    @classmethod
+    def encode(cls, data):
+        counts = {}
+        cls.count_strings(data, counts)
+
+        # The most frequent strings get the smallest indexes
+        strings = sorted((s for s, n in counts.items() if n > 1 and len(s) >= 3), key=lambda s: (-counts[s], s))
+        refs = {s: i for i, s in enumerate(strings)}
+
+        out = bytearray(b"\x93")
+        cls.pack(cls.MAGIC, {}, out)
+        cls.pack(strings, {}, out)
+        cls.pack(data, refs, out)
+
+        return bytes(out)
+
+    @classmethod
+    def pack(cls, obj, refs, out):
+        if obj is None:
+            out += b"\xc0"
+        elif obj is True:
+            out += b"\xc3"
+        elif obj is False:
+            out += b"\xc2"
+        elif isinstance(obj, str):
+            i = refs.get(obj, None)
+            if i is not None:
+                if i < 0x100:
+                    out += struct.pack(">BbB", 0xd4, cls.STRING_REF, i)
+                elif i < 0x10000:
+                    out += struct.pack(">BbH", 0xd5, cls.STRING_REF, i)
+                else:
+                    out += struct.pack(">BbI", 0xd6, cls.STRING_REF, i)
+                return
+
+            b = obj.encode("utf-8")
+            n = len(b)
+            if n < 32:
+                out.append(0xa0 | n)
+            elif n < 0x100:
+                out += struct.pack(">BB", 0xd9, n)
+            elif n < 0x10000:
+                out += struct.pack(">BH", 0xda, n)
+            else:
+                out += struct.pack(">BI", 0xdb, n)
+            out += b
+        elif isinstance(obj, int):
+            if 0 <= obj < 0x80:
+                out.append(obj)
+            elif -32 <= obj < 0:
+                out.append(obj & 0xff)
+            elif 0 <= obj < 0x100:
+                out += struct.pack(">BB", 0xcc, obj)
+            elif 0 <= obj < 0x10000:
+                out += struct.pack(">BH", 0xcd, obj)
+            elif 0 <= obj < 0x100000000:
+                out += struct.pack(">BI", 0xce, obj)
+            elif obj >= 0:
+                out += struct.pack(">BQ", 0xcf, obj)
+            elif obj >= -0x80:
+                out += struct.pack(">Bb", 0xd0, obj)
+            elif obj >= -0x8000:
+                out += struct.pack(">Bh", 0xd1, obj)
+            elif obj >= -0x80000000:
+                out += struct.pack(">Bi", 0xd2, obj)
+            else:
+                out += struct.pack(">Bq", 0xd3, obj)
+        elif isinstance(obj, float):
+            out += struct.pack(">Bd", 0xcb, obj)
+        elif isinstance(obj, (bytes, bytearray)):
+            n = len(obj)
+            if n < 0x100:
+                out += struct.pack(">BB", 0xc4, n)
+            elif n < 0x10000:
+                out += struct.pack(">BH", 0xc5, n)
+            else:
+                out += struct.pack(">BI", 0xc6, n)
+            out += obj
+        elif isinstance(obj, (list, tuple)):
+            n = len(obj)
+            if n < 16:
+                out.append(0x90 | n)
+            elif n < 0x10000:
+                out += struct.pack(">BH", 0xdc, n)
+            else:
+                out += struct.pack(">BI", 0xdd, n)
+
+            for v in obj:
+                cls.pack(v, refs, out)
+        elif isinstance(obj, dict):
+            n = len(obj)
+            if n < 16:
+                out.append(0x80 | n)
+            elif n < 0x10000:
+                out += struct.pack(">BH", 0xde, n)
+            else:
+                out += struct.pack(">BI", 0xdf, n)
+
+            for k, v in obj.items():
+                cls.pack(k, refs, out)
+                cls.pack(v, refs, out)
+        else:
+            raise TypeError(f"Type {type(obj).__name__} not serializable")
+
+    @classmethod
+    def decode(cls, buf):
+        buf = bytes(buf)
+        strings = []
+        unpack_from = struct.unpack_from
+
+        # Dispatch on the type byte, most common types first
+        def unpack(pos):
+            t = buf[pos]
+            pos += 1
+
+            if 0xa0 <= t <= 0xbf:
+                end = pos + (t & 0x1f)
+                return buf[pos:end].decode("utf-8"), end
+            elif t <= 0x7f:
+                return t, pos
+            elif t == 0xd4:
+                return strings[buf[pos + 1]], pos + 2
+            elif 0x80 <= t <= 0x8f:
+                d = {}
+                for _ in range(t & 0x0f):
+                    k, pos = unpack(pos)
+                    d[k], pos = unpack(pos)
+                return d, pos
+            elif 0x90 <= t <= 0x9f:
+                a = []
+                for _ in range(t & 0x0f):
+                    v, pos = unpack(pos)
+                    a.append(v)
+                return a, pos
+            elif t == 0xd5:
+                return strings[unpack_from(">H", buf, pos + 1)[0]], pos + 3
+            elif t == 0xd9:
+                end = pos + 1 + buf[pos]
+                return buf[pos + 1:end].decode("utf-8"), end
+            elif t == 0xda:
+                end = pos + 2 + unpack_from(">H", buf, pos)[0]
+                return buf[pos + 2:end].decode("utf-8"), end
+            elif t == 0xdb:
+                end = pos + 4 + unpack_from(">I", buf, pos)[0]
+                return buf[pos + 4:end].decode("utf-8"), end
+            elif t == 0xc0:
+                return None, pos
+            elif t == 0xc2:
+                return False, pos
+            elif t == 0xc3:
+                return True, pos
+            elif t >= 0xe0:
+                return t - 0x100, pos
+            elif t == 0xcc:
+                return buf[pos], pos + 1
+            elif t == 0xcd:
+                return unpack_from(">H", buf, pos)[0], pos + 2
+            elif t == 0xce:
+                return unpack_from(">I", buf, pos)[0], pos + 4
+            elif t == 0xcf:
+                return unpack_from(">Q", buf, pos)[0], pos + 8
+            elif t == 0xd0:
+                return unpack_from(">b", buf, pos)[0], pos + 1
+            elif t == 0xd1:
+                return unpack_from(">h", buf, pos)[0], pos + 2
+            elif t == 0xd2:
+                return unpack_from(">i", buf, pos)[0], pos + 4
+            elif t == 0xd3:
+                return unpack_from(">q", buf, pos)[0], pos + 8
+            elif t == 0xca:
+                return unpack_from(">f", buf, pos)[0], pos + 4
+            elif t == 0xcb:
+                return unpack_from(">d", buf, pos)[0], pos + 8
+            elif t == 0xd6:
+                return strings[unpack_from(">I", buf, pos + 1)[0]], pos + 5
+            elif t in (0xc4, 0xc5, 0xc6):
+                size = {0xc4: 1, 0xc5: 2, 0xc6: 4}[t]
+                end = pos + size + int.from_bytes(buf[pos:pos + size], "big")
+                return buf[pos + size:end], end
+            elif t in (0xdc, 0xdd):
+                size = 2 if t == 0xdc else 4
+                n = int.from_bytes(buf[pos:pos + size], "big")
+                pos += size
+                a = []
+                for _ in range(n):
+                    v, pos = unpack(pos)
+                    a.append(v)
+                return a, pos
+            elif t in (0xde, 0xdf):
+                size = 2 if t == 0xde else 4
+                n = int.from_bytes(buf[pos:pos + size], "big")
+                pos += size
+                d = {}
+                for _ in range(n):
+                    k, pos = unpack(pos)
+                    d[k], pos = unpack(pos)
+                return d, pos
+
+            raise ValueError(f"Unsupported MessagePack type 0x{t:02x} at offset {pos - 1}")
+
+        if len(buf) == 0 or buf[0] != 0x93:
+            raise ValueError("Not a packed data file")
+
+        magic, pos = unpack(1)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a packed data file")
+
+        table, pos = unpack(pos)
+        strings.extend(table)
+
+        data, pos = unpack(pos)
+        return data
+
+class OnePaceIndex:
+    EPISODE_COLUMNS = "arc, episode, manga_chapters, anime_episodes, released, duration, extended, archived, " + \
+        "hash_crc32, hash_blake2s, file_id, file_name, file_size, file_hash, file_index"
+    OTHER_EDIT_COLUMNS = "edit_name, arc, episode, title, description, manga_chapters, anime_episodes, " + \
+        "released, duration, extended, hash_crc32, hash_blake2s"
+    INFO_COLUMNS = ("status", "manga_chapters", "num_of_chapters", "anime_episodes", "episodes_adapted",
+        "filler_episodes", "num_of_pace_eps", "piece_minutes", "pace_minutes", "audio_languages",
+        "sub_languages", "pixeldrain_only", "resolution", "arc_watch_guide")
+    INFO_INTEGERS = ("num_of_chapters", "episodes_adapted", "num_of_pace_eps", "piece_minutes", "pace_minutes")
+
+    # Results are cached and shared between callers, so treat them as read-only.
+    # Archived episodes are only in data.sqlite, so archived=True has no effect on the JSON sources
+    def __init__(self, source, lang="en", cache_size=4096, archived=False):
+        self.source = Path(source)
+        self.lang = lang
+        self.archived = archived
+        self.archived_filter = "" if archived else " AND archived = 0"
+        self.conn = None
+
+        if self.source.suffix == ".sqlite":
+            self.conn = sqlite3.connect(f"file:{self.source}?mode=ro", uri=True, check_same_thread=False, cached_statements=32)
+        elif self.source.suffix == ".msgpack":
+            self.load_json(PackedData.decode(self.source.read_bytes()))
+        elif self.source.is_dir():
+            data = {}
+            for key in ("arcs", "descriptions", "episodes", "other_edits"):
+                with Path(self.source, f"{key}.min.json").open(mode="r", encoding="utf-8") as f:
+                    data[key] = json.load(f)
+
+            self.load_json(data)
+        else:
+            with self.source.open(mode="r", encoding="utf-8") as f:
+                self.load_json(json.load(f))
+
+        self.by_crc32 = lru_cache(maxsize=cache_size)(self.find_crc32)
+        self.by_blake2 = lru_cache(maxsize=cache_size)(self.find_blake2)
+        self.by_episode = lru_cache(maxsize=cache_size)(self.find_episode)
+        self.by_other_edit = lru_cache(maxsize=cache_size)(self.find_other_edit)
+        self.arc = lru_cache(maxsize=cache_size)(self.find_arc)
+        self.description = lru_cache(maxsize=cache_size)(self.find_description)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def load_json(self, data):
+        self.episodes = {}
+        self.episodes_by_blake2 = {}
+        self.episodes_by_number = {}
+
+        for crc32, all_eps in data.get("episodes", {}).items():
+            for ep in [all_eps] if isinstance(all_eps, dict) else all_eps:
+                if ep.get("archived", False) and not self.archived:
+                    continue
+
+                hashes = ep.get("hashes", {})
+                file = ep.get("file", {})
+
+                episode = self.episode_from_row((
+                    ep.get("arc", 0),
+                    ep.get("episode", 0),
+                    ep.get("manga_chapters", ""),
+                    ep.get("anime_episodes", ""),
+                    ep.get("released", ""),
+                    int(ep.get("duration", 0)),
+                    1 if ep.get("extended", False) else 0,
+                    1 if ep.get("archived", False) else 0,
+                    str(hashes.get("crc32", "")).upper(),
+                    str(hashes.get("blake2s", "")).lower(),
+                    file.get("id", 0),
+                    file.get("name", ""),
+                    file.get("size", ""),
+                    file.get("hash", ""),
+                    file.get("index", 0)
+                ))
+
+                self.episodes.setdefault(crc32.upper(), []).append(episode)
+
+                if episode["hashes"]["blake2s"] != "":
+                    self.episodes_by_blake2.setdefault(episode["hashes"]["blake2s"], []).append(episode)
+
+                if not episode["archived"]:
+                    self.episodes_by_number.setdefault((int(episode["arc"]), int(episode["episode"])), []).append(episode)
+
+        for episodes in self.episodes.values():
+            episodes.sort(key=lambda x: x["archived"])
+
+        self.arcs = {}
+        for lang, arcs in data.get("arcs", {}).items():
+            for arc in arcs:
+                if arc.get("part", "") == "":
+                    continue
+
+                self.arcs[(lang, int(arc.get("part", 0)))] = {
+                    "part": int(arc.get("part", 0)),
+                    "saga": arc.get("saga", ""),
+                    "title": arc.get("title", ""),
+                    "originaltitle": arc.get("originaltitle", ""),
+                    "shortcode": arc.get("shortcode", ""),
+                    "mkvcode": arc.get("mkvcode", ""),
+                    "description": arc.get("description", ""),
+                    "info": {k: arc.get("info", {}).get(k, 0 if k in self.INFO_INTEGERS else "") for k in self.INFO_COLUMNS}
+                }
+
+        self.descriptions = {}
+        for lang, descriptions in data.get("descriptions", {}).items():
+            for desc in descriptions:
+                # data.sqlite keeps these as text, where an integer lookup never finds them
+                try:
+                    key = (lang, int(desc.get("arc", 0)), int(desc.get("episode", 0)))
+                except (TypeError, ValueError):
+                    continue
+
+                self.descriptions[key] = {
+                    "title": desc.get("title", ""),
+                    "originaltitle": desc.get("originaltitle", ""),
+                    "description": desc.get("description", "")
+                }
+
+        self.other_edits = {}
+        self.other_edits_by_crc32 = {}
+        self.other_edits_by_blake2 = {}
+
+        for edit_name, edits in data.get("other_edits", {}).items():
+            self.other_edits[edit_name] = []
+
+            for ep in edits.values():
+                hashes = ep.get("hashes", {})
+
+                edit = self.other_edit_from_row((
+                    edit_name,
+                    ep.get("arc", 0),
+                    ep.get("episode", 0),
+                    ep.get("title", ""),
+                    ep.get("description", ""),
+                    ep.get("manga_chapters", ""),
+                    ep.get("anime_episodes", ""),
+                    ep.get("released", ""),
+                    ep.get("duration", 0),
+                    1 if ep.get("extended", False) else 0,
+                    str(hashes.get("crc32", "")).upper(),
+                    str(hashes.get("blake2", "")).lower()
+                ))
+
+                self.other_edits[edit_name].append(edit)
+                self.other_edits_by_crc32.setdefault(edit[1]["hashes"]["crc32"], []).append(edit)
+                self.other_edits_by_blake2.setdefault(edit[1]["hashes"]["blake2"], []).append(edit)
+
+    def episode_from_row(self, row):
+        episode = {
+            "arc": row[0],
+            "episode": row[1],
+            "manga_chapters": row[2],
+            "anime_episodes": row[3],
+            "released": row[4],
+            "duration": row[5],
+            "extended": row[6] == 1,
+            "archived": row[7] == 1,
+            "hashes": {
+                "crc32": row[8],
+                "blake2s": row[9]
+            }
+        }
+
+        if row[11] != "":
+            episode["file"] = {
+                "id": row[10],
+                "name": row[11],
+                "size": row[12],
+                "hash": row[13],
+                "index": row[14]
+            }
+
+        return episode
+
+    def other_edit_from_row(self, row):
+        return (row[0], {
+            "arc": row[1],
+            "episode": row[2],
+            "title": row[3],
+            "description": row[4],
+            "manga_chapters": row[5],
+            "anime_episodes": row[6],
+            "released": row[7],
+            "duration": row[8],
+            "extended": row[9] == 1,
+            "hashes": {
+                "crc32": row[10],
+                "blake2": row[11]
+            }
+        })
+
+    def find_arc(self, part, lang=None):
+        lang = self.lang if lang is None else lang
+
+        if self.conn is None:
+            return self.arcs.get((lang, int(part)), None)
+
+        row = self.conn.execute(
+            "SELECT part, saga, title, originaltitle, shortcode, mkvcode, description FROM arcs WHERE lang = ? AND part = ?",
+            (lang, int(part))
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        info = self.conn.execute(f"SELECT {', '.join(self.INFO_COLUMNS)} FROM arc_info WHERE lang = ? AND arc_part = ? ORDER BY id LIMIT 1", (lang, int(part))).fetchone()
+
+        return {
+            "part": int(row[0]),
+            "saga": row[1],
+            "title": row[2],
+            "originaltitle": row[3],
+            "shortcode": row[4],
+            "mkvcode": row[5],
+            "description": row[6],
+            "info": dict(zip(self.INFO_COLUMNS, info)) if info is not None else {}
+        }
+
+    def find_description(self, arc, episode, lang=None):
+        lang = self.lang if lang is None else lang
+
+        if self.conn is None:
+            return self.descriptions.get((lang, int(arc), int(episode)), None)
+
+        row = self.conn.execute(
+            "SELECT title, originaltitle, description FROM descriptions WHERE lang = ? AND arc = ? AND episode = ?",
+            (lang, int(arc), int(episode))
+        ).fetchone()
+
+        return {"title": row[0], "originaltitle": row[1], "description": row[2]} if row is not None else None
+
+    def join_episode(self, episode, lang):
+        return {
+            "type": "episode",
+            "edit_name": None,
+            "episode": episode,
+            "arc": self.arc(episode.get("arc", 0), lang),
+            "description": self.description(episode.get("arc", 0), episode.get("episode", 0), lang)
+        }
+
+    def join_other_edit(self, edit_name, edit, lang):
+        return {
+            "type": "other_edit",
+            "edit_name": edit_name,
+            "episode": edit,
+            "arc": self.arc(edit.get("arc", 0), lang),
+            "description": {
+                "title": edit.get("title", ""),
+                "originaltitle": "",
+                "description": edit.get("description", "")
+            }
+        }
+
+    def find_crc32(self, crc32, lang=None):
+        crc32 = (f"{crc32:08X}" if isinstance(crc32, int) else str(crc32)).upper()
+
+        if self.conn is None:
+            episodes = self.episodes.get(crc32, [])
+            edits = self.other_edits_by_crc32.get(crc32, [])
+        else:
+            episodes = [self.episode_from_row(row) for row in self.conn.execute(
+                f"SELECT {self.EPISODE_COLUMNS} FROM episodes WHERE hash_crc32 = ?{self.archived_filter} ORDER BY archived, id", (crc32,)
+            )]
+            edits = [] if len(episodes) > 0 else [self.other_edit_from_row(row) for row in self.conn.execute(
+                f"SELECT {self.OTHER_EDIT_COLUMNS} FROM other_edits WHERE hash_crc32 = ? ORDER BY id", (crc32,)
+            )]
+
+        if len(episodes) > 0:
+            return self.join_episode(episodes[0], lang)
+        elif len(edits) > 0:
+            return self.join_other_edit(edits[0][0], edits[0][1], lang)
+
+        return None
+
+    def find_blake2(self, blake2, lang=None):
+        blake2 = str(blake2).lower()
+
+        if self.conn is None:
+            episodes = self.episodes_by_blake2.get(blake2, [])
+            edits = self.other_edits_by_blake2.get(blake2, [])
+        else:
+            episodes = [self.episode_from_row(row) for row in self.conn.execute(
+                f"SELECT {self.EPISODE_COLUMNS} FROM episodes WHERE hash_blake2s = ?{self.archived_filter} ORDER BY archived, id", (blake2,)
+            )]
+            edits = [] if len(episodes) > 0 else [self.other_edit_from_row(row) for row in self.conn.execute(
+                f"SELECT {self.OTHER_EDIT_COLUMNS} FROM other_edits WHERE hash_blake2s = ? ORDER BY id", (blake2,)
+            )]
+
+        if len(episodes) > 0:
+            return self.join_episode(episodes[0], lang)
+        elif len(edits) > 0:
+            return self.join_other_edit(edits[0][0], edits[0][1], lang)
+
+        return None
+
+    def find_episode(self, arc, episode, lang=None):
+        if self.conn is None:
+            episodes = self.episodes_by_number.get((int(arc), int(episode)), [])
+        else:
+            episodes = [self.episode_from_row(row) for row in self.conn.execute(
+                f"SELECT {self.EPISODE_COLUMNS} FROM episodes WHERE arc = ? AND episode = ? AND archived = 0 ORDER BY extended, id",
+                (int(arc), int(episode))
+            )]
+
+        return tuple(self.join_episode(ep, lang) for ep in sorted(episodes, key=lambda x: x["extended"]))
+
+    def find_other_edit(self, edit_name, lang=None):
+        if self.conn is None:
+            edits = self.other_edits.get(edit_name, [])
+        else:
+            edits = [self.other_edit_from_row(row) for row in self.conn.execute(
+                f"SELECT {self.OTHER_EDIT_COLUMNS} FROM other_edits WHERE edit_name = ? ORDER BY id", (edit_name,)
+            )]
+
+        return tuple(self.join_other_edit(name, edit, lang) for name, edit in edits)
 
 if __name__ == "__main__":
     if sys.argv[1] == "update":
@@ -2004,3 +4429,9 @@ if __name__ == "__main__":
         OnePaceMetadata().cmd_update(True)
     elif sys.argv[1] == "json":
         OnePaceMetadata().cmd_json()
+    elif sys.argv[1] == "force_json":
+        OnePaceMetadata().cmd_json(True)
+    elif sys.argv[1] == "identify":
+        OnePaceMetadata().cmd_identify(sys.argv[2], *[int(i) for i in sys.argv[3:4]])
+    elif sys.argv[1] == "backfill":
+        OnePaceMetadata().cmd_backfill(sys.argv[2], *[int(i) for i in sys.argv[3:4]])
@@ -10,6 +10,7 @@ CREATE TABLE "arc_episodes" (
 CREATE TABLE "arc_info" (
 	"id"	INTEGER,
 	"arc_part"	INTEGER,
+	"lang"	TEXT,
 	"status"	TEXT,
 	"manga_chapters"	TEXT,
 	"num_of_chapters"	INTEGER,